@@ -0,0 +1,94 @@
+"""
+Benchmark de memória dos registros tipados (__slots__) e lotes por colunas contra dicionários
+
+Os documentos são gerados em BSON no formato do journey_customer (schema declarado no JourneyCustomerRepository,
+incluindo o dicionário aninhado `data`) e decodificados das três formas. É medida a memória retida ao final
+(tracemalloc) e o tempo de decodificação.
+
+Uso:
+    $ python -m benchmarks.record_memory 100000
+"""
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from bson import ObjectId, encode, decode
+
+from flow.business.repository.journey_customer_repository import JourneyCustomerRepository
+from flow.libs.databases.storage.record import RecordCodec, ColumnBatch
+
+
+def build_documents(size: int) -> list:
+    start = datetime(2020, 1, 1)
+    return [
+        encode({
+            '_id': ObjectId(),
+            'journey_name': f'journey_{index % 10}',
+            'shelf_id': f'{index:012d}',
+            'data': {
+                'journey_instance_id': f'{index:024x}',
+                'step': index % 7,
+                'customer': {'document': f'{index:011d}', 'score': index / 3}
+            },
+            '__inserted__': {'at': start + timedelta(seconds=index)}
+        })
+        for index in range(size)
+    ]
+
+
+def as_dicts(buffers: list) -> list:
+    result = list()
+    for buffer in buffers:
+        item = decode(buffer)
+        item['_id'] = str(item['_id'])
+        result.append(item)
+
+    return result
+
+
+def as_records(buffers: list, record_class: type) -> list:
+    codec = RecordCodec(record_class)
+    return [codec.decode(decode(buffer)) for buffer in buffers]
+
+
+def as_columns(buffers: list, record_class: type) -> ColumnBatch:
+    batch = ColumnBatch(record_class)
+    batch.extend(decode(buffer) for buffer in buffers)
+    return batch
+
+
+def measure(function, *args) -> tuple:
+    tracemalloc.start()
+    start = perf_counter()
+    result = function(*args)
+    elapsed = perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+    return retained, elapsed
+
+
+def main(argv: list):
+    size = int(argv[0]) if argv else 100000
+    buffers = build_documents(size)
+    record_class = JourneyCustomerRepository.record_class
+
+    results = [
+        ('dict', measure(as_dicts, buffers)),
+        ('record (__slots__)', measure(as_records, buffers, record_class)),
+        ('column batch', measure(as_columns, buffers, record_class))
+    ]
+
+    baseline = results[0][1][0]
+
+    print(f'{size} documentos')
+    print(f'{"formato":<20} {"memória (MB)":>13} {"bytes/doc":>10} {"vs dict":>8} {"tempo (s)":>10}')
+    for name, (retained, elapsed) in results:
+        print(f'{name:<20} {retained / 2 ** 20:>13.1f} {retained / size:>10.0f} {retained / baseline:>8.0%} '
+              f'{elapsed:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,10 +1,19 @@
+from datetime import datetime
+
 from flow.libs.databases.storage.resource import storage_resource
 from flow.libs.databases.storage.crud_base import CrudBase
 
 
 @storage_resource(
     database='smart_journey',
-    subject='journey_customer'
+    subject='journey_customer',
+    indexes=['shelf_id#ASC,journey_name#ASC'],
+    schema={
+        'journey_name': str,
+        'shelf_id': str,
+        'data': dict,
+        '__inserted__.at': datetime
+    }
 )
 class JourneyCustomerRepository(CrudBase):
     pass
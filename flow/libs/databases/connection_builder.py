@@ -3,8 +3,16 @@ from pymongo.mongo_client import MongoClient
 from redis import Redis
 import os
 
+from flow.libs.databases.hash_ring import HashRing
 
-def get_storage_connection(type_connection: str, database: str, subject: str) -> Collection:
+_storage_clients = dict()
+_in_memory_rings = dict()
+_in_memory_servers = dict()
+_async_storage_clients = dict()
+_async_in_memory_pools = dict()
+
+
+def _storage_connection_params(type_connection: str, database: str) -> dict:
     host = os.environ.get(f'STORAGE_{type_connection}_HOST', '192.168.0.14')
     port = int(os.environ.get(f'STORAGE_{type_connection}_PORT', '27017'))
     username = os.environ.get(f'STORAGE_{type_connection}_USER')
@@ -25,10 +33,174 @@ def get_storage_connection(type_connection: str, database: str, subject: str) ->
             'authMechanism': auth_mechanism
         })
 
-    return MongoClient(**connection)[database][subject]
+    return connection
 
 
-def get_in_memory_connection(type_connection: str) -> Redis:
+def _in_memory_connection_params(type_connection: str) -> tuple:
     host = os.environ.get(f'IN_MEMORY_{type_connection}_HOST', '192.168.0.14')
     port = os.environ.get(f'IN_MEMORY_{type_connection}_PORT', '6379')
-    return Redis(host, int(port))
+    return host, int(port)
+
+
+def get_storage_client(type_connection: str, database: str):
+    """
+    Retorna o MongoClient do tipo de conexão e banco, compartilhado entre os repositórios (o client mantém o pool de
+    conexões)
+    """
+    client = _storage_clients.get((type_connection, database))
+
+    if client is None:
+        client = MongoClient(**_storage_connection_params(type_connection, database))
+        _storage_clients[(type_connection, database)] = client
+
+    return client
+
+
+def get_storage_connection(type_connection: str, database: str, subject: str) -> Collection:
+    return get_storage_client(type_connection, database)[database][subject]
+
+
+def _in_memory_nodes(type_connection: str) -> list:
+    """
+    Lista de nós (host:port) de um tipo de conexão
+
+    IN_MEMORY_<TYPE>_HOSTS aceita uma lista separada por vírgula (ex.: "redis1:6379,redis2:6379"). Quando não
+    informada, utiliza IN_MEMORY_<TYPE>_HOST e IN_MEMORY_<TYPE>_PORT
+    """
+    hosts = os.environ.get(f'IN_MEMORY_{type_connection}_HOSTS')
+
+    if not hosts:
+        return ['{}:{}'.format(*_in_memory_connection_params(type_connection))]
+
+    nodes = [item.strip() for item in hosts.split(',') if item.strip()]
+    return [item if ':' in item else f'{item}:6379' for item in nodes]
+
+
+def _in_memory_node_address(node: str) -> tuple:
+    host, port = node.rsplit(':', 1)
+    return host, int(port)
+
+
+def _has_wildcard(pattern: str) -> bool:
+    return any(char in pattern for char in '*?[')
+
+
+def get_in_memory_ring(type_connection: str) -> HashRing:
+    ring = _in_memory_rings.get(type_connection)
+
+    if ring is None:
+        ring = _in_memory_rings[type_connection] = HashRing(_in_memory_nodes(type_connection))
+
+    return ring
+
+
+def _get_in_memory_server(node: str) -> Redis:
+    server = _in_memory_servers.get(node)
+
+    if server is None:
+        server = _in_memory_servers[node] = Redis(*_in_memory_node_address(node))
+
+    return server
+
+
+def get_in_memory_connection(type_connection: str, key: str = None) -> Redis:
+    """
+    Retorna a conexão do nó responsável pela chave (hash consistente). Sem chave, retorna a conexão do primeiro nó
+    """
+    ring = get_in_memory_ring(type_connection)
+    node = ring.get_node(key) if key is not None else ring.nodes[0]
+    return _get_in_memory_server(node)
+
+
+def get_in_memory_connections(type_connection: str, pattern: str = None) -> list:
+    """
+    Retorna as conexões de todos os nós. Se o padrão informado não possuir curingas, retorna apenas a conexão do nó
+    responsável por ele
+    """
+    if pattern is not None and not _has_wildcard(pattern):
+        return [get_in_memory_connection(type_connection, pattern)]
+
+    return [_get_in_memory_server(node) for node in get_in_memory_ring(type_connection).nodes]
+
+
+def group_by_in_memory_connection(type_connection: str, keys: list) -> list:
+    """
+    Agrupa as chaves por nó, para operações em lote (pipeline) por nó
+
+    :return: Lista de tuplas (conexão, chaves do nó)
+    """
+    groups = get_in_memory_ring(type_connection).group(keys)
+    return [(_get_in_memory_server(node), node_keys) for node, node_keys in groups.items()]
+
+
+def get_async_storage_connection(type_connection: str, database: str, subject: str):
+    """
+    Retorna uma coleção do motor (driver asyncio do MongoDB). O client é compartilhado por tipo de conexão e banco
+
+    O motor é uma dependência opcional, necessária apenas para as classes assíncronas
+    """
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient
+    except ImportError:  # pragma: no cover
+        raise ImportError('O pacote "motor" é necessário para utilizar as classes assíncronas de storage')
+
+    client = _async_storage_clients.get((type_connection, database))
+
+    if client is None:
+        client = AsyncIOMotorClient(**_storage_connection_params(type_connection, database))
+        _async_storage_clients[(type_connection, database)] = client
+
+    return client[database][subject]
+
+
+async def _get_async_in_memory_pool(node: str):
+    try:
+        import aioredis
+    except ImportError:  # pragma: no cover
+        raise ImportError('O pacote "aioredis" é necessário para utilizar as classes assíncronas de in memory')
+
+    pool = _async_in_memory_pools.get(node)
+
+    if pool is None or pool.closed:
+        host, port = _in_memory_node_address(node)
+        new_pool = await aioredis.create_redis_pool(f'redis://{host}:{port}')
+
+        # Outra corrotina pode ter criado o pool enquanto esta aguardava a conexão
+        pool = _async_in_memory_pools.get(node)
+        if pool is None or pool.closed:
+            pool = _async_in_memory_pools[node] = new_pool
+        else:
+            new_pool.close()
+
+    return pool
+
+
+async def get_async_in_memory_connection(type_connection: str, key: str = None):
+    """
+    Retorna o pool de conexões do aioredis do nó responsável pela chave, compartilhado por nó
+
+    O aioredis é uma dependência opcional, necessária apenas para as classes assíncronas
+    """
+    ring = get_in_memory_ring(type_connection)
+    node = ring.get_node(key) if key is not None else ring.nodes[0]
+    return await _get_async_in_memory_pool(node)
+
+
+async def get_async_in_memory_connections(type_connection: str, pattern: str = None) -> list:
+    """
+    Variante assíncrona de get_in_memory_connections
+    """
+    if pattern is not None and not _has_wildcard(pattern):
+        return [await get_async_in_memory_connection(type_connection, pattern)]
+
+    return [await _get_async_in_memory_pool(node) for node in get_in_memory_ring(type_connection).nodes]
+
+
+async def group_by_async_in_memory_connection(type_connection: str, keys: list) -> list:
+    """
+    Variante assíncrona de group_by_in_memory_connection
+
+    :return: Lista de tuplas (pool de conexões, chaves do nó)
+    """
+    groups = get_in_memory_ring(type_connection).group(keys)
+    return [(await _get_async_in_memory_pool(node), node_keys) for node, node_keys in groups.items()]
@@ -0,0 +1,82 @@
+from bisect import bisect
+from hashlib import md5
+
+
+class HashRing(object):
+    """
+    Anel de hash consistente com nós virtuais
+
+    Cada nó ocupa `replicas` pontos no anel e a chave é atribuída ao primeiro ponto à sua direita. Ao adicionar ou
+    remover um nó apenas cerca de 1/N das chaves mudam de nó
+    """
+
+    def __init__(self, nodes: list = None, replicas: int = 160):
+        """
+        Inicialização do objeto
+
+        :param nodes: Lista com a identificação dos nós
+        :param replicas: Quantidade de nós virtuais por nó
+        """
+
+        self.replicas = replicas
+        self.nodes = list()
+        self.__points = list()
+        self.__ring = dict()
+
+        for node in nodes or list():
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(md5(value.encode()).digest()[:8], 'big')
+
+    def add_node(self, node: str):
+        if node in self.nodes:
+            return
+
+        self.nodes.append(node)
+        for index in range(self.replicas):
+            self.__ring[self._hash(f'{node}#{index}')] = node
+
+        self.__points = sorted(self.__ring)
+
+    def remove_node(self, node: str):
+        if node not in self.nodes:
+            return
+
+        self.nodes.remove(node)
+        for index in range(self.replicas):
+            self.__ring.pop(self._hash(f'{node}#{index}'), None)
+
+        self.__points = sorted(self.__ring)
+
+    def get_node(self, key: str) -> str:
+        """
+        Retorna o nó responsável pela chave
+
+        :param key: Chave a ser roteada
+        :return: Identificação do nó
+        """
+
+        if not self.__points:
+            raise ValueError('O anel de hash não possui nós')
+
+        if len(self.nodes) == 1:
+            return self.nodes[0]
+
+        index = bisect(self.__points, self._hash(key)) % len(self.__points)
+        return self.__ring[self.__points[index]]
+
+    def group(self, keys: list) -> dict:
+        """
+        Agrupa as chaves por nó
+
+        :param keys: Lista de chaves
+        :return: Dicionário com o nó e a lista de chaves atribuídas a ele (na ordem original)
+        """
+
+        groups = dict()
+        for key in keys:
+            groups.setdefault(self.get_node(key), list()).append(key)
+
+        return groups
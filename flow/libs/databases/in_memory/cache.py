@@ -1,13 +1,17 @@
-from flow.libs.databases.connection_builder import get_in_memory_connection
+from flow.libs.databases.connection_builder import get_in_memory_connection, get_in_memory_connections, \
+    group_by_in_memory_connection, get_async_in_memory_connection, get_async_in_memory_connections, \
+    group_by_async_in_memory_connection
 from json import dumps, loads
 
 
-class Cache:
-    __slots__ = ('type', 'subject', '__separator', '__ttl', '__server')
+class CacheBase:
+    """
+    Classe base do Cache e do AsyncCache, responsável pela montagem da chave e pelo controle de TTL
+    """
+    __slots__ = ('type', 'subject', '__separator', '__ttl')
 
     def __init__(self, separator=':', subject='NA'):
         self.__separator = separator
-        self.__server = None
         self.__ttl = 0
         self.type = 'CACHE'
         self.subject = subject
@@ -26,17 +30,19 @@ class Cache:
         classes.reverse()
 
         for item in classes:
-            if issubclass(item, Cache):
+            if issubclass(item, CacheBase):
                 properties.extend(item.__slots__)
 
         return self.__separator.join(str(getattr(self, key)) for key in properties if not key.startswith('__'))
 
+
+class Cache(CacheBase):
+    __slots__ = ()
+
     @property
     def connection(self):
-        if self.__server is None:
-            self.__server = get_in_memory_connection('CACHE')
-
-        return self.__server
+        """Conexão do nó responsável pela chave"""
+        return get_in_memory_connection('CACHE', str(self))
 
     def get_value(self) -> dict:
         buffer = self.connection.get(str(self))
@@ -50,6 +56,107 @@ class Cache:
             self.connection.set(str(self), dumps(buffer))
 
     def delete(self):
-        keys = self.connection.keys(str(self))
-        for item in keys:
-            self.connection.delete(item.decode())
+        for connection in get_in_memory_connections('CACHE', str(self)):
+            keys = connection.keys(str(self))
+            for item in keys:
+                connection.delete(item.decode())
+
+    @staticmethod
+    def get_values(caches: list) -> list:
+        """
+        Recupera os valores de vários caches com um MGET por nó
+
+        :param caches: Lista de instâncias de Cache
+        :return: Lista com os valores, na mesma ordem dos caches
+        """
+        keys = [str(item) for item in caches]
+        values = dict()
+
+        for connection, node_keys in group_by_in_memory_connection('CACHE', keys):
+            values.update(zip(node_keys, connection.mget(node_keys)))
+
+        return [loads(values[key].decode()) if values[key] else None for key in keys]
+
+    @staticmethod
+    def set_values(items: list):
+        """
+        Grava os valores de vários caches com um pipeline por nó
+
+        :param items: Lista de tuplas (cache, valor)
+        """
+        caches = {str(cache): (cache, buffer) for cache, buffer in items}
+
+        for connection, node_keys in group_by_in_memory_connection('CACHE', list(caches)):
+            pipe = connection.pipeline()
+            for key in node_keys:
+                cache, buffer = caches[key]
+                if cache.ttl:
+                    pipe.setex(key, cache.ttl, dumps(buffer))
+                else:
+                    pipe.set(key, dumps(buffer))
+            pipe.execute()
+
+
+class AsyncCache(CacheBase):
+    """
+    Variante assíncrona (asyncio) do Cache. A montagem da chave e o controle de TTL são herdados da CacheBase
+    """
+    __slots__ = ()
+
+    async def get_connection(self):
+        """Pool de conexões (aioredis) do nó responsável pela chave"""
+        return await get_async_in_memory_connection('CACHE', str(self))
+
+    async def get_value(self) -> dict:
+        connection = await self.get_connection()
+        buffer = await connection.get(str(self))
+        if buffer:
+            return loads(buffer.decode())
+
+    async def set_value(self, buffer: dict):
+        connection = await self.get_connection()
+        if self.ttl:
+            await connection.setex(str(self), self.ttl, dumps(buffer))
+        else:
+            await connection.set(str(self), dumps(buffer))
+
+    async def delete(self):
+        for connection in await get_async_in_memory_connections('CACHE', str(self)):
+            keys = await connection.keys(str(self))
+            for item in keys:
+                await connection.delete(item.decode())
+
+    @staticmethod
+    async def get_values(caches: list) -> list:
+        """
+        Recupera os valores de vários caches com um MGET por nó
+
+        :param caches: Lista de instâncias de AsyncCache
+        :return: Lista com os valores, na mesma ordem dos caches
+        """
+        keys = [str(item) for item in caches]
+        values = dict()
+
+        for connection, node_keys in await group_by_async_in_memory_connection('CACHE', keys):
+            values.update(zip(node_keys, await connection.mget(*node_keys)))
+
+        return [loads(values[key].decode()) if values[key] else None for key in keys]
+
+    @staticmethod
+    async def set_values(items: list):
+        """
+        Grava os valores de vários caches com um pipeline por nó
+
+        :param items: Lista de tuplas (cache, valor)
+        """
+        caches = {str(cache): (cache, buffer) for cache, buffer in items}
+
+        for connection, node_keys in await group_by_async_in_memory_connection('CACHE', list(caches)):
+            pipe = connection.pipeline()
+            for key in node_keys:
+                cache, buffer = caches[key]
+                if cache.ttl:
+                    pipe.setex(key, cache.ttl, dumps(buffer))
+                else:
+                    pipe.set(key, dumps(buffer))
+            await pipe.execute()
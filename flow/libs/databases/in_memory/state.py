@@ -1,13 +1,17 @@
-from flow.libs.databases.connection_builder import get_in_memory_connection
+from flow.libs.databases.connection_builder import get_in_memory_connection, get_in_memory_connections, \
+    group_by_in_memory_connection, get_async_in_memory_connection, get_async_in_memory_connections, \
+    group_by_async_in_memory_connection
 
 
-class State:
-    __slots__ = ('type', 'subject', '__separator', '__ttl', '__server')
+class StateBase:
+    """
+    Classe base do State e do AsyncState, responsável pela montagem da chave e pelo controle de TTL
+    """
+    __slots__ = ('type', 'subject', '__separator', '__ttl')
 
     def __init__(self, separator=':'):
         self.__separator = separator
         self.__ttl = 0
-        self.__server = None
         self.type = 'STATE'
         self.subject = 'NA'
 
@@ -17,7 +21,7 @@ class State:
         classes.reverse()
 
         for item in classes:
-            if issubclass(item, State):
+            if issubclass(item, StateBase):
                 properties.extend(item.__slots__)
 
         return self.__separator.join(str(getattr(self, key)) for key in properties if not key.startswith('__'))
@@ -30,28 +34,31 @@ class State:
     def ttl(self, value):
         self.__ttl = value
 
+    @staticmethod
+    def _buffer_decode(buffer: dict):
+        return {k.decode(): v.decode() for k, v in buffer.items()}
+
+
+class State(StateBase):
+    __slots__ = ()
+
     def exists(self) -> bool:
         return self.connection.exists(str(self))
 
     def delete(self):
-        keys = self.connection.keys(str(self))
-        for item in keys:
-            self.connection.delete(item.decode())
+        for connection in get_in_memory_connections('STATE', str(self)):
+            keys = connection.keys(str(self))
+            for item in keys:
+                connection.delete(item.decode())
 
     def reset_value(self):
         if self.exists():
             self.delete()
 
-    @staticmethod
-    def _buffer_decode(buffer: dict):
-        return {k.decode(): v.decode() for k, v in buffer.items()}
-
     @property
     def connection(self):
-        if self.__server is None:
-            self.__server = get_in_memory_connection('STATE')
-
-        return self.__server
+        """Conexão do nó responsável pela chave"""
+        return get_in_memory_connection('STATE', str(self))
 
     def get_value(self) -> dict:
         buffer = self.connection.hgetall(str(self))
@@ -88,3 +95,141 @@ class State:
         if self.ttl:
             pipe.expire(str(self), self.ttl)
         pipe.execute()
+
+    @staticmethod
+    def get_values(states: list) -> list:
+        """
+        Recupera os valores de vários states com um pipeline por nó
+
+        :param states: Lista de instâncias de State
+        :return: Lista com os valores, na mesma ordem dos states
+        """
+        keys = [str(item) for item in states]
+        values = dict()
+
+        for connection, node_keys in group_by_in_memory_connection('STATE', keys):
+            pipe = connection.pipeline()
+            for key in node_keys:
+                pipe.hgetall(key)
+            values.update(zip(node_keys, pipe.execute()))
+
+        return [StateBase._buffer_decode(values[key]) if values[key] else None for key in keys]
+
+    @staticmethod
+    def set_values(items: list):
+        """
+        Substitui os valores de vários states com um pipeline por nó
+
+        :param items: Lista de tuplas (state, dados)
+        """
+        states = {str(state): (state, data) for state, data in items}
+
+        for connection, node_keys in group_by_in_memory_connection('STATE', list(states)):
+            pipe = connection.pipeline()
+            for key in node_keys:
+                state, data = states[key]
+                pipe.delete(key)
+                pipe.hmset(key, data)
+                if state.ttl:
+                    pipe.expire(key, state.ttl)
+            pipe.execute()
+
+
+class AsyncState(StateBase):
+    """
+    Variante assíncrona (asyncio) do State. A montagem da chave e o controle de TTL são herdados da StateBase
+    """
+    __slots__ = ()
+
+    async def get_connection(self):
+        """Pool de conexões (aioredis) do nó responsável pela chave"""
+        return await get_async_in_memory_connection('STATE', str(self))
+
+    async def exists(self) -> bool:
+        connection = await self.get_connection()
+        return bool(await connection.exists(str(self)))
+
+    async def delete(self):
+        for connection in await get_async_in_memory_connections('STATE', str(self)):
+            keys = await connection.keys(str(self))
+            for item in keys:
+                await connection.delete(item.decode())
+
+    async def reset_value(self):
+        if await self.exists():
+            await self.delete()
+
+    async def get_value(self) -> dict:
+        connection = await self.get_connection()
+        buffer = await connection.hgetall(str(self))
+        if buffer:
+            return self._buffer_decode(buffer)
+
+    async def get_field(self, field_name: str):
+        """Recupera o valor de um campo interno do HASH"""
+        connection = await self.get_connection()
+        buffer = await connection.hget(str(self), field_name)
+        return buffer.decode() if buffer else None
+
+    async def get_fields(self, field_names: list):
+        connection = await self.get_connection()
+        values = await connection.hmget(str(self), *field_names)
+        return dict(zip(field_names, [item.decode() if item is not None else None for item in values]))
+
+    async def set_value(self, data: dict):
+        await self.reset_value()
+        await self.set_fields(data)
+
+    async def set_field(self, field_name: str, field_value: str):
+        connection = await self.get_connection()
+        pipe = connection.pipeline()
+        pipe.hset(str(self), field_name, field_value)
+        if self.ttl:
+            pipe.expire(str(self), self.ttl)
+        await pipe.execute()
+
+    async def set_fields(self, data: dict):
+        connection = await self.get_connection()
+        pipe = connection.pipeline()
+        pipe.hmset_dict(str(self), data)
+        if self.ttl:
+            pipe.expire(str(self), self.ttl)
+        await pipe.execute()
+
+    @staticmethod
+    async def get_values(states: list) -> list:
+        """
+        Recupera os valores de vários states com um pipeline por nó
+
+        :param states: Lista de instâncias de AsyncState
+        :return: Lista com os valores, na mesma ordem dos states
+        """
+        keys = [str(item) for item in states]
+        values = dict()
+
+        for connection, node_keys in await group_by_async_in_memory_connection('STATE', keys):
+            pipe = connection.pipeline()
+            for key in node_keys:
+                pipe.hgetall(key)
+            values.update(zip(node_keys, await pipe.execute()))
+
+        return [StateBase._buffer_decode(values[key]) if values[key] else None for key in keys]
+
+    @staticmethod
+    async def set_values(items: list):
+        """
+        Substitui os valores de vários states com um pipeline por nó
+
+        :param items: Lista de tuplas (state, dados)
+        """
+        states = {str(state): (state, data) for state, data in items}
+
+        for connection, node_keys in await group_by_async_in_memory_connection('STATE', list(states)):
+            pipe = connection.pipeline()
+            for key in node_keys:
+                state, data = states[key]
+                pipe.delete(key)
+                pipe.hmset_dict(key, data)
+                if state.ttl:
+                    pipe.expire(key, state.ttl)
+            await pipe.execute()
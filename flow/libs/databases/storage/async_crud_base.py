@@ -0,0 +1,304 @@
+from bson import ObjectId
+from werkzeug.exceptions import NotFound, Forbidden
+
+from flow.libs.databases.connection_builder import get_async_storage_connection
+from flow.libs.databases.storage.paginator import Paginator
+from flow.libs.databases.storage.record import ColumnBatch
+from flow.libs.databases.storage.storage_base import StorageBase
+from flow.libs.datetime import now_utc_datetime
+
+
+class AsyncCrudBase(StorageBase):
+    """
+    Variante assíncrona (asyncio) da CrudBase, baseada no motor
+
+    A normalização de filtros, chaves, projeções e ordenações é herdada da StorageBase, a mesma da CrudBase. O
+    decorator storage_resource é aplicado da mesma forma nas classes filha. Todos os métodos que acessam o Storage,
+    inclusive os de cache, são corrotinas
+    """
+
+    def __init__(self):
+        """
+        Inicialização do objeto
+        """
+
+        self.__connection = None
+
+    async def clear_cache(self, old_data: dict, is_multi: bool):
+        """
+        Método acionado para proceder com limpeza de cache
+
+        Deve ser sobrescrito nas classes filha da AsyncCrudBase que possuam caches a limpar
+
+        :param old_data: Dados antes da alteração. Se is_multi for False, esse valor será um dicionário em branco
+        :param is_multi: Indica se está alterando mais do que um documento
+        """
+        pass
+
+    async def prime_cache(self):
+        """
+        Método acionado na inicialização do serviço para carregar previamente os caches mais acessados
+
+        Deve ser sobrescrito nas classes filha da AsyncCrudBase que possuam caches a carregar
+        """
+        pass
+
+    @property
+    def connection(self):
+        """
+        Propriedade para devolver uma connection (motor) configurada
+        """
+        if self.__connection is None:
+            self.__connection = get_async_storage_connection('STORAGE', self.database, self.subject)
+
+        return self.__connection
+
+    async def ensure_indexes(self) -> list:
+        """
+        Cria (caso não existam) os índices declarados no storage_resource
+
+        :return: Lista com o nome dos índices
+        """
+
+        return [await self.connection.create_index(keys) for keys in self._index_keys()]
+
+    async def __validate_resource(self, key: dict, _id: str=None):
+        """
+        Validador da existência de um recurso com base nos campos chave. Apenas quando a flag verify_insert estiver
+        atiada.
+
+        :param key: Dicionário com a chave normalizada
+        :param _id: Id do documento atual (usado para verificação de edição)
+        """
+
+        exists = await self.connection.count_documents(self._resource_filter(key, _id), limit=1) > 0
+
+        if exists:
+            raise Forbidden(f'O recurso com a chave [{self._query_to_string(key)}] já existe')
+
+    async def prepare_insert(self, data: dict) -> dict:
+        """
+        Prepara um item para inserção: valida a existência do recurso (quando verify_insert estiver ativada) e
+        registra a data de inserção
+
+        :param data: item a ser inserido
+        :return: Item preparado
+        """
+
+        if self.verify_insert:
+            key = self._normalize_key(data)
+            await self.__validate_resource(key)
+
+        data['__inserted__'] = {
+            'at': now_utc_datetime()
+        }
+
+        return data
+
+    async def insert_one(self, data: dict) -> dict:
+        """
+        Insere um item no Storage
+
+        :param data: item a ser inserido
+        """
+
+        await self.prepare_insert(data)
+
+        res = await self.connection.insert_one(data)
+        return {'_id': str(res.inserted_id)}
+
+    async def insert_many(self, items: list) -> dict:
+        """
+        Insere mais do que um item no Storage
+
+        :param items: Lista de itens a serem inseridos
+        """
+
+        for item in items:
+            await self.prepare_insert(item)
+
+        res = await self.connection.insert_many(items)
+        return {'_ids': [str(_id) for _id in res.inserted_ids]}
+
+    async def iter_many(self, query: dict=None, projection: list=None, sorting: list=None):
+        """
+        Itera sobre os itens de forma assíncrona, sem carregar a listagem inteira em memória
+
+        :param query: Dicionário contendo um filtro pré informado
+        :param projection: Lista contendo a projeção de dados
+        :param sorting: Lista contendo a ordenação dos dados
+        """
+
+        cursor = self.connection.find(
+            self._extend_filter(query),
+            self._normalize_projection(projection)
+        ).sort(self._normalize_sorting(sorting))
+
+        async for item in cursor:
+            yield self.normalize_item(item)
+
+    async def find_many(self, query: dict=None, projection: list=None, page_number: int=None, per_page: int=None,
+                        sorting: list=None) -> dict:
+        """
+        Obtem uma listagem dos itens
+
+        :param query: Dicionário contendo um filtro pré informado
+        :param projection: Lista contendo a projeção de dados
+        :param page_number: Número da página
+        :param per_page: Itens por página
+        :param sorting: Lista contendo a ordenação dos dados
+        """
+
+        if not page_number:
+            _list = [item async for item in self.iter_many(query, projection, sorting)]
+
+            return {
+                'total_records': len(_list),
+                'list': _list
+            }
+
+        _filter = self._extend_filter(query)
+        total_records = await self.connection.count_documents(_filter)
+
+        # O Paginator é usado apenas para validar o número da página e calcular o total de páginas
+        p = Paginator(range(total_records), per_page=per_page or 25)
+        number = p.validate_number(page_number)
+
+        cursor = self.connection.find(
+            _filter,
+            self._normalize_projection(projection)
+        ).sort(self._normalize_sorting(sorting)).skip((number - 1) * p.per_page).limit(p.per_page)
+
+        _list = [self.normalize_item(item) async for item in cursor]
+
+        return {
+            'page_records': len(_list),
+            'total_records': p.count,
+            'list': _list,
+            'page': page_number,
+            'total_pages': p.num_pages,
+            'per_page': per_page
+        }
+
+    def _record_cursor(self, query: dict=None, sorting: list=None):
+        codec = self._record_codec()
+
+        cursor = self.connection.find(
+            self._extend_filter(query),
+            self._normalize_projection(codec.projection)
+        ).sort(self._normalize_sorting(sorting))
+
+        return codec, cursor
+
+    async def find_records(self, query: dict=None, sorting: list=None) -> list:
+        """
+        Obtem uma listagem dos itens como registros tipados (schema declarado no storage_resource)
+
+        :param query: Dicionário contendo um filtro pré informado
+        :param sorting: Lista contendo a ordenação dos dados
+        :return: Lista de registros
+        """
+
+        codec, cursor = self._record_cursor(query, sorting)
+        return [codec.decode(item) async for item in cursor]
+
+    async def find_columns(self, query: dict=None, sorting: list=None) -> ColumnBatch:
+        """
+        Obtem uma listagem dos itens em um lote por colunas (schema declarado no storage_resource)
+
+        :param query: Dicionário contendo um filtro pré informado
+        :param sorting: Lista contendo a ordenação dos dados
+        :return: Lote de registros por colunas
+        """
+
+        _, cursor = self._record_cursor(query, sorting)
+
+        batch = ColumnBatch(self.record_class)
+        async for item in cursor:
+            batch.append(item)
+
+        return batch
+
+    async def find_one(self, _id: str, projection: list=None) -> dict:
+        """
+        Obtem um item específico
+        :param _id: Identificação do Item
+        :param projection: Lista contendo a projeção de dados
+        """
+
+        query = self._extend_filter({
+            "_id": ObjectId(_id)
+        })
+
+        item = await self.connection.find_one(
+            query,
+            self._normalize_projection(projection)
+        )
+
+        if not item:
+            raise NotFound(f'Registro [{self._query_to_string(query)}] não localizado')
+
+        return self.normalize_item(item)
+
+    async def update_one(self, _id: str, data: dict):
+        """
+        Atualiza um item específico
+
+        :param _id: Identificação do Item
+        :param data: Dados da atualização do item
+        """
+        if self.verify_insert:
+            key = self._normalize_key(data)
+            await self.__validate_resource(key, _id)
+
+        old_item = await self.find_one(_id)
+
+        query = self._extend_filter({
+            "_id": ObjectId(_id)
+        })
+
+        data['__updated__'] = {
+            'at': now_utc_datetime()
+        }
+
+        res = await self.connection.update_one(
+            query,
+            {'$set': data}
+        )
+
+        await self.clear_cache(old_item, False)
+
+        return {'matched': res.matched_count, 'updated': res.modified_count}
+
+    async def remove_one(self, _id: str):
+        """
+        Deleta um item específico
+
+        :param _id: Identificação do Item
+        """
+        old_item = await self.find_one(_id)
+
+        query = self._extend_filter({
+            "_id": ObjectId(_id)
+        })
+
+        res = await self.connection.delete_one(query)
+
+        await self.clear_cache(old_item, False)
+
+        return {'deleted': res.deleted_count}
+
+    async def remove_many(self, query: dict=None):
+        """
+        Deleta mais do que um item
+
+        :param query: Dicionário contendo um filtro pré informado
+        """
+
+        res = await self.connection.delete_many(
+            self._extend_filter(query)
+        )
+
+        await self.clear_cache({}, True)
+
+        return {'deleted': res.deleted_count}
@@ -1,29 +1,19 @@
 from builtins import list
 from bson import ObjectId
 from werkzeug.exceptions import NotFound, Forbidden
-from pymongo import ASCENDING, DESCENDING
-from copy import deepcopy
 
 from flow.libs.databases.connection_builder import get_storage_connection
 from flow.libs.databases.storage.paginator import Paginator
+from flow.libs.databases.storage.record import ColumnBatch
+from flow.libs.databases.storage.storage_base import StorageBase
 from flow.libs.datetime import now_utc_datetime
 
-MAP_SORTING = {
-    'ASC': ASCENDING,
-    'DESC': DESCENDING
-}
 
-
-class CrudBase(object):
+class CrudBase(StorageBase):
     """
     Classe base responsável por lidar com métodos de interação com o CRUD no MongoDB
     """
 
-    subject = None
-    database = None
-    verify_insert = None
-    key_fields = None
-
     def __init__(self):
         """
         Inicialização do objeto
@@ -35,125 +25,42 @@ class CrudBase(object):
         """
         Método acionado para proceder com limpeza de cache
 
-        O mesmo deve ser implementando nas classes filha da classe StorageBase
+        Deve ser sobrescrito nas classes filha da CrudBase que possuam caches a limpar
 
         :param old_data: Dados antes da alteração. Se is_multi for False, esse valor será um dicionário em branco
         :param is_multi: Indica se está alterando mais do que um documento
         """
         pass
 
-    @property
-    def connection(self):
-        """
-        Propriedade para devolver uma connection configurada
-        """
-        if self.__connection is None:
-            self.__connection = get_storage_connection('STORAGE', self.database, self.subject)
-
-        return self.__connection
-
-    @staticmethod
-    def __normalize_sorting(sorting: list):
-        if not sorting:
-            return [("_id", ASCENDING)]
-
-        return [
-            (item.split('#')[0], MAP_SORTING.get(item.split('#')[1], ASCENDING)) for item in sorting
-        ]
-
-    def normalize_item(self, data: dict) -> dict or None:
-        """
-        Método para normalizar um item. A principal ideia aqui é permitir que esse método seja extendido
-        em classes derivadas
-
-        :param data: Item a ser normalizado
-        :return: Item normalizado
-        """
-
-        if not data:
-            return None
-
-        if "_id" in data:
-            data["_id"] = str(data["_id"])
-
-        return data
-
-    def normalize_item_list(self, data: dict) -> dict or None:
+    def prime_cache(self):
         """
-        Método para normalizar um item de uma lista. A principal ideia aqui é permitir que esse método seja extendido
-        em classes derivadas
+        Método acionado na inicialização do serviço para carregar previamente os caches mais acessados
 
-        :param data: Item a ser normalizado
-        :return: Item normalizado
+        Deve ser sobrescrito nas classes filha da CrudBase que possuam caches a carregar
         """
-        if not data:
-            return None
-
-        if "_id" in data:
-            data["_id"] = str(data["_id"])
-
-        return data
-
-    @staticmethod
-    def __normalize_projection(_projection: list):
-        if not _projection:
-            return None
-
-        projection = {item: 1 for item in _projection}
-
-        if "_id" not in projection:
-            projection['_id'] = 0
-
-        return projection
-
-    def __normalize_key(self, data: dict) -> dict:
-        """
-        Método para normalizar a chave de busca e validação de item
-
-        Somente o primeiro nível so Json/Dict é considerado
-
-        :param data: Dados específicos
-        :return: Dicionário com a chave normalizada
-        """
-
-        key = {item: data.get(item) for item in self.key_fields}
-
-        self.__extend_filter(key)
-
-        return key
+        pass
 
-    def __extend_filter(self, _filter: dict):
+    def ensure_indexes(self) -> list:
         """
-        Método para normalizar e extender um filtro (para verificar a existência do registro)
+        Cria (caso não existam) os índices declarados no storage_resource
 
-        A particularidade fica sobre o campo _id que se existir deve conter um ObjectID
+        Cada índice é uma string com os campos separados por vírgula, no mesmo formato da ordenação
+        (ex.: 'shelf_id#ASC,journey_name#DESC')
 
-        :param _filter: Filtro não extendido
-        :return: Dicionário com o filtro extendido e normalizado
+        :return: Lista com o nome dos índices
         """
-        if _filter is None:
-            _filter = dict()
-
-        if '_id' in _filter and isinstance(_filter['_id'], str):
-            _filter['_id'] = ObjectId(_filter['_id'])
 
-        return _filter
+        return [self.connection.create_index(keys) for keys in self._index_keys()]
 
-    @staticmethod
-    def __query_to_string(key: dict):
+    @property
+    def connection(self):
         """
-        Método para transformar uma chave em uma string legível
-
-        :param key: Dicionário com a chave normalizada
-        :return: String legível da chave
+        Propriedade para devolver uma connection configurada
         """
+        if self.__connection is None:
+            self.__connection = get_storage_connection('STORAGE', self.database, self.subject)
 
-        fields = list()
-
-        for k, v in key.items():
-            fields.append(f'{k}: {str(v)}')
-
-        return ', '.join(fields)
+        return self.__connection
 
     def __validate_resource(self, key: dict, _id: str=None):
         """
@@ -164,33 +71,39 @@ class CrudBase(object):
         :param _id: Id do documento atual (usado para verificação de edição)
         """
 
-        _filter = deepcopy(key)
-
-        if _id:
-            _filter['_id'] = {
-                '$ne': ObjectId(_id)
-            }
-
-        exists = self.connection.find(_filter).limit(1).count(True) > 0
+        exists = self.connection.find(self._resource_filter(key, _id)).limit(1).count(True) > 0
 
         if exists:
-            raise Forbidden(f'O recurso com a chave [{self.__query_to_string(key)}] já existe')
+            raise Forbidden(f'O recurso com a chave [{self._query_to_string(key)}] já existe')
 
-    def insert_one(self, data: dict) -> dict:
+    def prepare_insert(self, data: dict) -> dict:
         """
-        Insere um item no Storage
+        Prepara um item para inserção: valida a existência do recurso (quando verify_insert estiver ativada) e
+        registra a data de inserção
 
         :param data: item a ser inserido
+        :return: Item preparado
         """
 
         if self.verify_insert:
-            key = self.__normalize_key(data)
+            key = self._normalize_key(data)
             self.__validate_resource(key)
 
         data['__inserted__'] = {
             'at': now_utc_datetime()
         }
 
+        return data
+
+    def insert_one(self, data: dict) -> dict:
+        """
+        Insere um item no Storage
+
+        :param data: item a ser inserido
+        """
+
+        self.prepare_insert(data)
+
         _id = str(self.connection.insert_one(data).inserted_id)
         return {'_id': _id}
 
@@ -202,14 +115,7 @@ class CrudBase(object):
         """
 
         for item in items:
-
-            if self.verify_insert:
-                key = self.__normalize_key(item)
-                self.__validate_resource(key)
-
-            item['__inserted__'] = {
-                'at': now_utc_datetime()
-            }
+            self.prepare_insert(item)
 
         res = self.connection.insert_many(items)
         return {'_ids': [str(_id) for _id in res.inserted_ids]}
@@ -227,9 +133,9 @@ class CrudBase(object):
         """
 
         cursor = self.connection.find(
-            self.__extend_filter(query),
-            self.__normalize_projection(projection)
-        ).sort(self.__normalize_sorting(sorting))
+            self._extend_filter(query),
+            self._normalize_projection(projection)
+        ).sort(self._normalize_sorting(sorting))
 
         if page_number:
             p = Paginator(cursor, per_page=per_page or 25)
@@ -253,6 +159,45 @@ class CrudBase(object):
                 'list': _list
             }
 
+    def _record_cursor(self, query: dict=None, sorting: list=None):
+        codec = self._record_codec()
+
+        cursor = self.connection.find(
+            self._extend_filter(query),
+            self._normalize_projection(codec.projection)
+        ).sort(self._normalize_sorting(sorting))
+
+        return codec, cursor
+
+    def find_records(self, query: dict=None, sorting: list=None) -> list:
+        """
+        Obtem uma listagem dos itens como registros tipados (schema declarado no storage_resource)
+
+        Apenas os campos do schema são trazidos do Storage
+
+        :param query: Dicionário contendo um filtro pré informado
+        :param sorting: Lista contendo a ordenação dos dados
+        :return: Lista de registros
+        """
+
+        codec, cursor = self._record_cursor(query, sorting)
+        return [codec.decode(item) for item in cursor]
+
+    def find_columns(self, query: dict=None, sorting: list=None) -> ColumnBatch:
+        """
+        Obtem uma listagem dos itens em um lote por colunas (schema declarado no storage_resource)
+
+        :param query: Dicionário contendo um filtro pré informado
+        :param sorting: Lista contendo a ordenação dos dados
+        :return: Lote de registros por colunas
+        """
+
+        _, cursor = self._record_cursor(query, sorting)
+
+        batch = ColumnBatch(self.record_class)
+        batch.extend(cursor)
+        return batch
+
     def find_one(self, _id: str, projection: list=None) -> dict:
         """
         Obtem um item específico
@@ -260,17 +205,17 @@ class CrudBase(object):
         :param projection: Lista contendo a projeção de dados
         """
 
-        query = self.__extend_filter({
+        query = self._extend_filter({
             "_id": ObjectId(_id)
         })
 
         item = self.connection.find_one(
             query,
-            self.__normalize_projection(projection)
+            self._normalize_projection(projection)
         )
 
         if not item:
-            raise NotFound(f'Registro [{self.__query_to_string(query)}] não localizado')
+            raise NotFound(f'Registro [{self._query_to_string(query)}] não localizado')
 
         return self.normalize_item(item)
 
@@ -282,12 +227,12 @@ class CrudBase(object):
         :param data: Dados da atualização do item
         """
         if self.verify_insert:
-            key = self.__normalize_key(data)
+            key = self._normalize_key(data)
             self.__validate_resource(key, _id)
 
         old_item = self.find_one(_id)
 
-        query = self.__extend_filter({
+        query = self._extend_filter({
             "_id": ObjectId(_id)
         })
 
@@ -296,7 +241,7 @@ class CrudBase(object):
         }
 
         res = self.connection.update_one(
-            self.__extend_filter(query),
+            self._extend_filter(query),
             {'$set': data}
         )
 
@@ -312,12 +257,12 @@ class CrudBase(object):
         """
         old_item = self.find_one(_id)
 
-        query = self.__extend_filter({
+        query = self._extend_filter({
             "_id": ObjectId(_id)
         })
 
         res = self.connection.delete_one(
-            self.__extend_filter(query)
+            self._extend_filter(query)
         )
 
         self.clear_cache(old_item, False)
@@ -331,10 +276,10 @@ class CrudBase(object):
         :param query: Dicionário contendo um filtro pré informado
         """
 
-        query = self.__extend_filter(query)
+        query = self._extend_filter(query)
 
         res = self.connection.delete_many(
-            self.__extend_filter(query)
+            self._extend_filter(query)
         )
 
         self.clear_cache({}, True)
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from werkzeug.exceptions import BadRequest
+
+from flow.libs.databases.storage.crud_base import CrudBase
+
+ALLOWED_METHODS = ('find_one', 'find_many')
+
+
+def _run_query(repository: CrudBase, method: str, params: dict) -> dict:
+    """
+    Executa uma consulta isolada medindo o tempo gasto
+
+    :param repository: Instância do repositório (derivado de CrudBase)
+    :param method: Nome do método de consulta (find_one ou find_many)
+    :param params: Parâmetros nomeados do método de consulta
+    :return: Dicionário com o resultado, o erro (se houver) e o tempo gasto em segundos
+    """
+
+    start = perf_counter()
+
+    try:
+        result, error = getattr(repository, method)(**params), None
+    except Exception as ex:
+        result, error = None, ex
+
+    return {
+        'result': result,
+        'error': error,
+        'elapsed': perf_counter() - start
+    }
+
+
+def multi_find(queries: dict, max_workers: int = 8) -> dict:
+    """
+    Executa um conjunto de consultas independentes de forma concorrente
+
+    As consultas são executadas em um pool limitado de threads. Dentro do nameko (eventlet com monkey patch) as
+    threads do pool são green threads, portanto o tempo total fica próximo ao da consulta mais lenta.
+
+    Exemplo:
+        multi_find({
+            'customer': (JourneyCustomerRepository(), 'find_one', {'_id': journey_instance_id}),
+            'journeys': (JourneyCustomerRepository(), 'find_many', {'query': {'shelf_id': shelf_id}})
+        })
+
+    :param queries: Dicionário com a chave da consulta e uma tupla (repositório, método, parâmetros)
+    :param max_workers: Número máximo de consultas simultâneas
+    :return: Dicionário com a chave da consulta e o resultado, o erro (se houver) e o tempo gasto de cada uma
+    """
+
+    for key, query in queries.items():
+        if not isinstance(query, (tuple, list)) or len(query) != 3:
+            raise BadRequest(f'A consulta [{key}] deve ser uma tupla (repositório, método, parâmetros)')
+
+        repository, method, _ = query
+
+        if not isinstance(repository, CrudBase):
+            raise BadRequest(f'A consulta [{key}] não possui um repositório válido')
+
+        if method not in ALLOWED_METHODS:
+            raise BadRequest(f'O método [{method}] da consulta [{key}] não é permitido')
+
+    if not queries:
+        return dict()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+        futures = {
+            key: executor.submit(_run_query, repository, method, params or dict())
+            for key, (repository, method, params) in queries.items()
+        }
+
+    return {key: future.result() for key, future in futures.items()}
@@ -1,6 +1,6 @@
 # coding: utf-8
 
-import collections
+import collections.abc
 import pymongo.cursor
 from math import ceil
 
@@ -106,7 +106,7 @@ class Paginator(object):
     page_range = property(_get_page_range)
 
 
-class Page(collections.Sequence):
+class Page(collections.abc.Sequence):
     """
     - :param: number: O número desta página.
     - :param: object_list: A lista de objetos nesta página.
@@ -0,0 +1,279 @@
+from array import array
+from keyword import iskeyword
+
+from bson import ObjectId
+from werkzeug.exceptions import BadRequest, Forbidden
+
+ARRAY_TYPECODES = {
+    int: 'q',
+    float: 'd',
+    bool: 'b'
+}
+
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def field_attribute(path: str) -> str:
+    """
+    Nome do atributo de um campo do schema
+
+    Os níveis do caminho são unidos por "_" e os níveis reservados (ex.: __inserted__) perdem os sublinhados
+    das extremidades. Ex.: '__inserted__.at' -> 'inserted_at'
+
+    :param path: Caminho do campo no documento (níveis separados por ".")
+    :return: Nome do atributo
+    """
+
+    return '_'.join(
+        item.strip('_') if item.startswith('__') and item.endswith('__') else item for item in path.split('.')
+    )
+
+
+class Record(object):
+    """
+    Classe base dos registros tipados gerados a partir do schema declarado no storage_resource
+
+    Os registros usam __slots__, evitando o __dict__ por instância e os dicionários aninhados do documento
+    """
+
+    __slots__ = ()
+
+    schema = None
+    paths = None
+    types = None
+
+    def __init__(self, *args, **kwargs):
+        for key, value in zip(self.__slots__, args):
+            setattr(self, key, value)
+
+        for key in self.__slots__[len(args):]:
+            setattr(self, key, kwargs.get(key))
+
+    def __repr__(self):
+        fields = ', '.join(f'{key}={getattr(self, key)!r}' for key in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+def make_record_class(name: str, schema: dict) -> type:
+    """
+    Gera uma classe de registro com __slots__ a partir de um schema
+
+    O campo _id é sempre incluído (como string, da mesma forma que no normalize_item). Cada caminho deve gerar um
+    atributo válido e único, caso contrário o schema é recusado
+
+    :param name: Nome da classe
+    :param schema: Dicionário com o caminho do campo no documento e o seu tipo (ex.: {'shelf_id': str})
+    :return: Classe derivada de Record
+    """
+
+    schema = dict(schema)
+    schema.setdefault('_id', str)
+    paths = tuple(schema)
+    attributes = dict()
+
+    for path in paths:
+        attribute = field_attribute(path)
+
+        if not all(path.split('.')) or not attribute.isidentifier() or iskeyword(attribute) \
+                or attribute.startswith('__') or hasattr(Record, attribute):
+            raise Forbidden(f'O campo [{path}] do schema não gera um atributo válido [{attribute}]')
+
+        if attribute in attributes:
+            raise Forbidden(f'Os campos [{attributes[attribute]}] e [{path}] do schema geram o mesmo atributo '
+                            f'[{attribute}]')
+
+        attributes[attribute] = path
+
+    return type(name, (Record,), {
+        '__slots__': tuple(attributes),
+        'schema': schema,
+        'paths': tuple(tuple(path.split('.')) for path in paths),
+        'types': tuple(schema.values())
+    })
+
+
+def _get_path(document: dict, path: tuple):
+    value = document
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+
+    return value
+
+
+def _to_int(value) -> int:
+    # Doubles inteiros (ex.: 2.0) e bool são aceitos; o intervalo é o do int64 do BSON (e do array 'q')
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+
+    if isinstance(value, int) and INT64_MIN <= value <= INT64_MAX:
+        return int(value)
+
+    raise ValueError(value)
+
+
+def _to_float(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    raise ValueError(value)
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+
+    raise ValueError(value)
+
+
+def _to_str(value) -> str:
+    if isinstance(value, (str, ObjectId)):
+        return str(value)
+
+    raise ValueError(value)
+
+
+CONVERTERS = {
+    int: _to_int,
+    float: _to_float,
+    bool: _to_bool,
+    str: _to_str
+}
+
+
+class RecordCodec(object):
+    """
+    Codec responsável por converter documentos do pymongo em registros tipados
+
+    Os valores são convertidos para o tipo declarado no schema (ex.: um double inteiro do Mongo em um campo int) e os
+    incompatíveis são recusados, portanto find_records e find_columns retornam os mesmos valores. O ganho dos
+    registros é de memória: o documento já decodificado pelo pymongo é copiado para o registro, o que custa um pouco
+    mais de tempo do que usar o próprio dicionário
+    """
+
+    def __init__(self, record_class: type):
+        self.record_class = record_class
+        self.__fields = [
+            (path, field_type, str if path == ('_id',) else CONVERTERS.get(field_type))
+            for path, field_type in zip(record_class.paths, record_class.types)
+        ]
+
+    @property
+    def projection(self) -> list:
+        """Projeção (primeiro nível) necessária para preencher os registros"""
+        return sorted({path[0] for path in self.record_class.paths})
+
+    def values(self, document: dict) -> list:
+        """
+        Valores do documento na ordem dos atributos do registro, convertidos para os tipos do schema
+
+        :param document: Documento retornado pelo pymongo
+        :return: Lista de valores (None para os campos ausentes)
+        """
+
+        values = list()
+
+        for path, field_type, converter in self.__fields:
+            value = _get_path(document, path)
+
+            if value is not None:
+                try:
+                    if converter is not None:
+                        value = converter(value)
+                    elif not isinstance(value, field_type):
+                        raise ValueError(value)
+                except ValueError:
+                    raise BadRequest(f'O valor [{value!r}] do campo [{".".join(path)}] não é compatível com o tipo '
+                                     f'[{field_type.__name__}] do schema')
+
+            values.append(value)
+
+        return values
+
+    def decode(self, document: dict) -> Record:
+        """
+        Converte um documento em registro
+
+        :param document: Documento retornado pelo pymongo
+        :return: Registro tipado
+        """
+        return self.record_class(*self.values(document))
+
+
+class ColumnBatch(object):
+    """
+    Lote de registros armazenado por colunas
+
+    Campos int, float e bool são armazenados em array.array (valores ausentes viram 0 e são marcados em uma máscara),
+    os demais em listas. Os valores são convertidos pelo RecordCodec antes de qualquer coluna ser alterada, portanto
+    um documento incompatível com o schema não desalinha as colunas
+    """
+
+    def __init__(self, record_class: type):
+        self.record_class = record_class
+        self.codec = RecordCodec(record_class)
+        self.columns = dict()
+        self.missing = dict()
+        self.__size = 0
+
+        self.__booleans = set()
+
+        for attribute, field_type in zip(record_class.__slots__, record_class.types):
+            typecode = ARRAY_TYPECODES.get(field_type)
+            if typecode:
+                self.columns[attribute] = array(typecode)
+                self.missing[attribute] = bytearray()
+                if field_type is bool:
+                    self.__booleans.add(attribute)
+            else:
+                self.columns[attribute] = list()
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        for index in range(self.__size):
+            yield self.record(index)
+
+    def append(self, document: dict):
+        """
+        Adiciona um documento ao lote
+
+        :param document: Documento retornado pelo pymongo
+        """
+
+        for attribute, value in zip(self.record_class.__slots__, self.codec.values(document)):
+            if attribute in self.missing:
+                self.missing[attribute].append(value is None)
+                value = 0 if value is None else value
+
+            self.columns[attribute].append(value)
+
+        self.__size += 1
+
+    def extend(self, documents):
+        for document in documents:
+            self.append(document)
+
+    def value(self, attribute: str, index: int):
+        if attribute in self.missing and self.missing[attribute][index]:
+            return None
+
+        value = self.columns[attribute][index]
+        return bool(value) if attribute in self.__booleans else value
+
+    def record(self, index: int) -> Record:
+        """
+        Monta o registro de uma posição do lote
+
+        :param index: Posição do registro
+        :return: Registro tipado
+        """
+        return self.record_class(*[self.value(attribute, index) for attribute in self.record_class.__slots__])
@@ -1,7 +1,10 @@
 from werkzeug.exceptions import Forbidden
 
+from flow.libs.databases.storage.record import make_record_class
 
-def storage_resource(database: str, subject: str, verify_insert: bool=False, key_fields: str=None):
+
+def storage_resource(database: str, subject: str, verify_insert: bool=False, key_fields: str=None,
+                     indexes: list=None, schema: dict=None):
     """
     Decorator responsável por definir o assunto e os campos chaves de uma coleção de dados
 
@@ -9,12 +12,18 @@ def storage_resource(database: str, subject: str, verify_insert: bool=False, key
     :param subject: Assunto da coleção de dados
     :param verify_insert: Indica se verifica a existencia de dados no insert
     :param key_fields: Campos chave da coleção de dados (para verificação de existência)
+    :param indexes: Índices da coleção de dados. Cada item contém os campos separados por vírgula, no formato da
+        ordenação (ex.: 'shelf_id#ASC,journey_name#DESC')
+    :param schema: Schema dos registros tipados (opcional). Dicionário com o caminho do campo no documento e o seu
+        tipo (ex.: {'shelf_id': str, '__inserted__.at': datetime})
     """
 
     def decorator(cls):
         setattr(cls, 'subject', subject)
         setattr(cls, 'database', database)
         setattr(cls, 'verify_insert', verify_insert)
+        setattr(cls, 'indexes', indexes)
+        setattr(cls, 'record_class', make_record_class(f'{cls.__name__}Record', schema) if schema else None)
 
         list_key_fields = key_fields.split(',') if key_fields else None
         if list_key_fields and '_id' in list_key_fields:
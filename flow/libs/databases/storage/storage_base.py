@@ -0,0 +1,167 @@
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from copy import deepcopy
+from werkzeug.exceptions import Forbidden
+
+from flow.libs.databases.storage.record import RecordCodec
+
+MAP_SORTING = {
+    'ASC': ASCENDING,
+    'DESC': DESCENDING
+}
+
+
+class StorageBase(object):
+    """
+    Classe base dos repositórios do Storage (CrudBase e AsyncCrudBase)
+
+    Contém apenas a definição do recurso (preenchida pelo storage_resource) e a normalização de filtros, chaves,
+    projeções e ordenações, que não acessam o Storage. Os métodos de acesso ficam nas classes filha, síncronos na
+    CrudBase e corrotinas na AsyncCrudBase
+    """
+
+    subject = None
+    database = None
+    verify_insert = None
+    key_fields = None
+    indexes = None
+    record_class = None
+
+    @staticmethod
+    def _normalize_sorting(sorting: list):
+        if not sorting:
+            return [("_id", ASCENDING)]
+
+        return [
+            (item.split('#')[0], MAP_SORTING.get(item.split('#')[1], ASCENDING)) for item in sorting
+        ]
+
+    def _index_keys(self) -> list:
+        """
+        Chaves dos índices declarados no storage_resource
+
+        Cada índice é uma string com os campos separados por vírgula, no mesmo formato da ordenação
+        (ex.: 'shelf_id#ASC,journey_name#DESC')
+
+        :return: Lista com as chaves de cada índice
+        """
+        return [self._normalize_sorting(index.split(',')) for index in self.indexes or list()]
+
+    def normalize_item(self, data: dict) -> dict or None:
+        """
+        Método para normalizar um item. A principal ideia aqui é permitir que esse método seja extendido
+        em classes derivadas
+
+        :param data: Item a ser normalizado
+        :return: Item normalizado
+        """
+
+        if not data:
+            return None
+
+        if "_id" in data:
+            data["_id"] = str(data["_id"])
+
+        return data
+
+    def normalize_item_list(self, data: dict) -> dict or None:
+        """
+        Método para normalizar um item de uma lista. A principal ideia aqui é permitir que esse método seja extendido
+        em classes derivadas
+
+        :param data: Item a ser normalizado
+        :return: Item normalizado
+        """
+        if not data:
+            return None
+
+        if "_id" in data:
+            data["_id"] = str(data["_id"])
+
+        return data
+
+    @staticmethod
+    def _normalize_projection(_projection: list):
+        if not _projection:
+            return None
+
+        projection = {item: 1 for item in _projection}
+
+        if "_id" not in projection:
+            projection['_id'] = 0
+
+        return projection
+
+    def _normalize_key(self, data: dict) -> dict:
+        """
+        Método para normalizar a chave de busca e validação de item
+
+        Somente o primeiro nível so Json/Dict é considerado
+
+        :param data: Dados específicos
+        :return: Dicionário com a chave normalizada
+        """
+
+        key = {item: data.get(item) for item in self.key_fields}
+
+        self._extend_filter(key)
+
+        return key
+
+    def _extend_filter(self, _filter: dict):
+        """
+        Método para normalizar e extender um filtro (para verificar a existência do registro)
+
+        A particularidade fica sobre o campo _id que se existir deve conter um ObjectID
+
+        :param _filter: Filtro não extendido
+        :return: Dicionário com o filtro extendido e normalizado
+        """
+        if _filter is None:
+            _filter = dict()
+
+        if '_id' in _filter and isinstance(_filter['_id'], str):
+            _filter['_id'] = ObjectId(_filter['_id'])
+
+        return _filter
+
+    @staticmethod
+    def _resource_filter(key: dict, _id: str=None) -> dict:
+        """
+        Filtro da validação de existência de um recurso
+
+        :param key: Dicionário com a chave normalizada
+        :param _id: Id do documento atual (usado para verificação de edição)
+        :return: Filtro que ignora o próprio documento
+        """
+
+        _filter = deepcopy(key)
+
+        if _id:
+            _filter['_id'] = {
+                '$ne': ObjectId(_id)
+            }
+
+        return _filter
+
+    @staticmethod
+    def _query_to_string(key: dict):
+        """
+        Método para transformar uma chave em uma string legível
+
+        :param key: Dicionário com a chave normalizada
+        :return: String legível da chave
+        """
+
+        fields = list()
+
+        for k, v in key.items():
+            fields.append(f'{k}: {str(v)}')
+
+        return ', '.join(fields)
+
+    def _record_codec(self) -> RecordCodec:
+        if self.record_class is None:
+            raise Forbidden(f'O recurso [{self.subject}] não possui schema de registros tipados')
+
+        return RecordCodec(self.record_class)
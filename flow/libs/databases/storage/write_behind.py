@@ -0,0 +1,228 @@
+import os
+import socket
+from time import time
+
+from bson import ObjectId, encode, decode
+from pymongo.errors import BulkWriteError
+from redis.exceptions import ResponseError
+
+from flow.libs.databases.connection_builder import get_in_memory_connection
+from flow.libs.databases.storage.crud_base import CrudBase
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class WriteBehind(object):
+    """
+    Classe responsável pela inserção assíncrona (write-behind) de documentos de um repositório
+
+    Os documentos recebem o _id no cliente e são enfileirados em um Redis Stream. O flusher, via consumer group,
+    drena o stream para o MongoDB com insert_many. A entrega é at-least-once: as mensagens só são confirmadas (XACK)
+    após a gravação, mensagens pendentes de consumidores inativos são reivindicadas (XCLAIM) e documentos já gravados
+    (chave duplicada no _id) são ignorados. Mensagens que atingem o limite de entregas sem sucesso são movidas para o
+    stream de dead letter
+    """
+
+    def __init__(self, repository: CrudBase, group: str = 'flusher', consumer: str = None,
+                 min_idle_time: int = 30000, max_deliveries: int = 5):
+        """
+        Inicialização do objeto
+
+        :param repository: Repositório de destino dos documentos
+        :param group: Nome do consumer group do stream
+        :param consumer: Nome do consumidor. Por padrão utiliza o host e o pid do processo
+        :param min_idle_time: Tempo (ms) que uma mensagem pendente deve aguardar antes de ser reivindicada
+        :param max_deliveries: Quantidade de entregas de uma mensagem antes de movê-la para o dead letter
+        """
+
+        if not isinstance(repository, CrudBase):
+            raise TypeError(f'O write-behind depende de um repositório CrudBase: [{type(repository).__name__}]')
+
+        # A verificação do verify_insert consulta apenas o MongoDB e não enxerga os documentos ainda no stream
+        if repository.verify_insert:
+            raise ValueError(f'O write-behind não suporta repositórios com verify_insert: [{repository.subject}]')
+
+        self.repository = repository
+        self.group = group
+        self.consumer = consumer or f'{socket.gethostname()}:{os.getpid()}'
+        self.min_idle_time = min_idle_time
+        self.max_deliveries = max_deliveries
+        self.__server = None
+        self.__has_group = False
+
+    def __str__(self):
+        return f'STREAM:{self.repository.database}:{self.repository.subject}'
+
+    @property
+    def dead_letter(self) -> str:
+        return f'{self}:DEAD'
+
+    @property
+    def connection(self):
+        if self.__server is None:
+            self.__server = get_in_memory_connection('STATE', str(self))
+
+        return self.__server
+
+    def enqueue(self, data: dict) -> dict:
+        """
+        Prepara o documento, gera o _id e o adiciona ao stream sem aguardar a gravação no MongoDB
+
+        :param data: Documento a ser inserido
+        :return: Dicionário com o _id gerado
+        """
+
+        self.repository.prepare_insert(data)
+        data['_id'] = ObjectId()
+
+        self.connection.xadd(str(self), {'document': encode(data)})
+        return {'_id': str(data['_id'])}
+
+    def __ensure_group(self):
+        if self.__has_group:
+            return
+
+        try:
+            self.connection.xgroup_create(str(self), self.group, id='0', mkstream=True)
+        except ResponseError as ex:
+            if 'BUSYGROUP' not in str(ex):
+                raise
+
+        self.__has_group = True
+
+    def __acknowledge(self, ids: list):
+        if not ids:
+            return
+
+        pipe = self.connection.pipeline()
+        pipe.xack(str(self), self.group, *ids)
+        pipe.xdel(str(self), *ids)
+        pipe.execute()
+
+    def __move_to_dead_letter(self, entries: list, deliveries: dict):
+        """
+        Move para o stream de dead letter as mensagens que atingiram o limite de entregas
+        """
+
+        connection = get_in_memory_connection('STATE', self.dead_letter)
+
+        for message_id, fields in entries:
+            print(f'Mensagem [{message_id.decode()}] do stream [{self}] movida para o dead letter após '
+                  f'[{deliveries[message_id]}] entregas')
+            connection.xadd(self.dead_letter, {
+                'document': fields[b'document'],
+                'message_id': message_id,
+                'times_delivered': deliveries[message_id]
+            })
+
+        self.__acknowledge([message_id for message_id, _ in entries])
+
+    def __claim_stale(self, count: int) -> list:
+        """
+        Reivindica mensagens entregues a consumidores que não as confirmaram dentro do min_idle_time
+
+        Mensagens já removidas do stream são apenas confirmadas e as que atingiram o limite de entregas são movidas para
+        o dead letter
+        """
+
+        pending = self.connection.xpending_range(str(self), self.group, '-', '+', count)
+        deliveries = {
+            item['message_id']: item['times_delivered']
+            for item in pending if item['time_since_delivered'] >= self.min_idle_time
+        }
+
+        if not deliveries:
+            return list()
+
+        claimed = self.connection.xclaim(str(self), self.group, self.consumer, self.min_idle_time, list(deliveries))
+        entries = [(message_id, fields) for message_id, fields in claimed if message_id is not None and fields]
+        found = {message_id for message_id, _ in entries}
+
+        self.__acknowledge([message_id for message_id in deliveries if message_id not in found])
+        self.__move_to_dead_letter(
+            [item for item in entries if deliveries[item[0]] >= self.max_deliveries], deliveries
+        )
+
+        return [item for item in entries if deliveries[item[0]] < self.max_deliveries]
+
+    def __read_new(self, count: int, block: int = None) -> list:
+        response = self.connection.xreadgroup(self.group, self.consumer, {str(self): '>'}, count=count, block=block)
+        return response[0][1] if response else list()
+
+    def __store(self, documents: list) -> set:
+        """
+        Grava os documentos ignorando os que já existem (reentregas de mensagens já gravadas)
+
+        :return: Posições dos documentos que não foram gravados
+        """
+
+        try:
+            self.repository.connection.insert_many(documents, ordered=False)
+        except BulkWriteError as ex:
+            return {
+                item['index'] for item in ex.details.get('writeErrors', []) if item.get('code') != DUPLICATE_KEY_ERROR
+            }
+
+        return set()
+
+    def flush(self, count: int = 500, block: int = None) -> dict:
+        """
+        Drena um lote de mensagens do stream para o MongoDB
+
+        Mensagens com falha de gravação permanecem pendentes e são reentregues após o min_idle_time
+
+        :param count: Quantidade máxima de mensagens do lote
+        :param block: Tempo (ms) de espera por novas mensagens. Por padrão não aguarda
+        :return: Dicionário com a quantidade de documentos gravados e com falha
+        """
+
+        self.__ensure_group()
+
+        entries = self.__claim_stale(count) or self.__read_new(count, block)
+        if not entries:
+            return {'flushed': 0, 'failed': 0}
+
+        failed = self.__store([decode(fields[b'document']) for _, fields in entries])
+        if failed:
+            print(f'[{len(failed)}] mensagens do stream [{self}] não foram gravadas e serão reentregues')
+
+        self.__acknowledge([message_id for index, (message_id, _) in enumerate(entries) if index not in failed])
+
+        return {'flushed': len(entries) - len(failed), 'failed': len(failed)}
+
+    def __pending(self) -> int:
+        """Quantidade de mensagens entregues e não confirmadas. Antes do primeiro flush o grupo ainda não existe"""
+        try:
+            return self.connection.xpending(str(self), self.group)['pending']
+        except ResponseError as ex:
+            if 'NOGROUP' not in str(ex):
+                raise
+
+            return 0
+
+    def lag(self) -> dict:
+        """
+        Métricas de atraso do write-behind
+
+        :return: Dicionário com a quantidade de mensagens ainda não gravadas, a quantidade de mensagens entregues e
+            ainda não confirmadas, a idade (ms) da mensagem mais antiga não gravada e a quantidade de mensagens no
+            dead letter
+        """
+
+        dead = get_in_memory_connection('STATE', self.dead_letter).xlen(self.dead_letter)
+
+        if not self.connection.exists(str(self)):
+            return {'length': 0, 'pending': 0, 'oldest_age': 0, 'dead': dead}
+
+        oldest = self.connection.xrange(str(self), count=1)
+        oldest_age = 0
+        if oldest:
+            created_at = int(oldest[0][0].decode().split('-')[0])
+            oldest_age = max(0, int(time() * 1000) - created_at)
+
+        return {
+            'length': self.connection.xlen(str(self)),
+            'pending': self.__pending(),
+            'oldest_age': oldest_age,
+            'dead': dead
+        }
@@ -0,0 +1,52 @@
+from time import perf_counter
+
+from flow.libs.databases.connection_builder import get_in_memory_connections
+from flow.libs.databases.storage.crud_base import CrudBase
+
+
+def warm_up_storage(repositories: list) -> dict:
+    """
+    Abre as conexões do storage (seleção de servidor e autenticação), garante os índices e carrega os caches dos
+    repositórios
+
+    :param repositories: Lista de classes de repositório (derivadas de CrudBase)
+    :return: Dicionário com o assunto de cada repositório e o tempo gasto em segundos
+    """
+
+    elapsed = dict()
+
+    for repository_class in repositories:
+        if not issubclass(repository_class, CrudBase):
+            raise TypeError(f'O warm up depende de repositórios CrudBase: [{repository_class.__name__}]')
+
+        start = perf_counter()
+
+        repository = repository_class()
+        repository.connection.database.command('ping')
+        repository.ensure_indexes()
+        repository.prime_cache()
+
+        elapsed[f'{repository.database}.{repository.subject}'] = perf_counter() - start
+
+    return elapsed
+
+
+def warm_up_in_memory(types_connection: list) -> dict:
+    """
+    Abre uma conexão no pool de cada nó dos tipos de conexão in memory informados
+
+    :param types_connection: Lista com os tipos de conexão (ex.: ['STATE', 'CACHE'])
+    :return: Dicionário com o tipo de conexão e o tempo gasto em segundos
+    """
+
+    elapsed = dict()
+
+    for type_connection in types_connection:
+        start = perf_counter()
+
+        for connection in get_in_memory_connections(type_connection):
+            connection.ping()
+
+        elapsed[type_connection] = perf_counter() - start
+
+    return elapsed
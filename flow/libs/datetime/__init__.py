@@ -1,3 +1,5 @@
-from flow.libs.datetime.timezone import now_utc_datetime, datetime_from_utc, datetime_to_utc
+from flow.libs.datetime.timezone import now_utc_datetime, datetime_from_utc, datetime_to_utc, get_timezone, \
+    datetimes_from_utc, datetimes_to_utc, datetime64_from_utc, datetime64_to_utc
 
-__all__ = ['now_utc_datetime', 'datetime_from_utc', 'datetime_to_utc']
+__all__ = ['now_utc_datetime', 'datetime_from_utc', 'datetime_to_utc', 'get_timezone', 'datetimes_from_utc',
+           'datetimes_to_utc', 'datetime64_from_utc', 'datetime64_to_utc']
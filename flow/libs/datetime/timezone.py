@@ -1,6 +1,25 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pytz import timezone, utc
 
+ONE_DAY = timedelta(days=1)
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = EPOCH.replace(tzinfo=utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+@lru_cache(maxsize=None)
+def get_timezone(str_zone: str):
+    """
+    Retorna o fuso horário informado, memorizando a busca
+
+    :param str_zone:
+        Nome do fuso horário
+    :return:
+        Fuso horário (pytz)
+    """
+    return timezone(str_zone)
+
 
 def datetime_from_utc(utctime: datetime, str_zone: str = 'America/Sao_Paulo') -> datetime:
     """
@@ -13,7 +32,7 @@ def datetime_from_utc(utctime: datetime, str_zone: str = 'America/Sao_Paulo') ->
     :return:
         Horário localizado para o fuso horário informado
     """
-    zone = timezone(str_zone)
+    zone = get_timezone(str_zone)
 
     if utctime.tzinfo == utc:
         buffer = utctime.astimezone(zone)
@@ -45,9 +64,202 @@ def datetime_to_utc(localtime: datetime, zone: str = 'America/Sao_Paulo') -> dat
     :return:
         Datetime no fuso UTC
     """
-    fuso = timezone(zone)
+    fuso = get_timezone(zone)
 
-    ano, mes, dia, hora, minuto, segundo, *_ = localtime.timetuple()
-    lc = fuso.localize(datetime(ano, mes, dia, hora, minuto, segundo))
+    lc = fuso.localize(localtime.replace(tzinfo=None, microsecond=0))
     return lc.astimezone(utc)
 
+
+def datetimes_from_utc(utctimes: list, str_zone: str = 'America/Sao_Paulo') -> list:
+    """
+    Converte uma lista de horários UTC para a zona de horário informada
+
+    Com o numpy instalado, os deslocamentos são obtidos de uma só vez nas tabelas de transição do fuso (as mesmas do
+    datetime64_from_utc), sem o fromutc do pytz por item. Sem o numpy, cada horário passa pelo datetime_from_utc
+
+    :param utctimes:
+        Lista de horários em UTC
+    :param str_zone:
+        Fuso horário de destino
+    :return:
+        Lista de horários localizados para o fuso horário informado
+    """
+    try:
+        _numpy()
+    except ImportError:
+        return [datetime_from_utc(item, str_zone) for item in utctimes]
+
+    # Horários com outro fuso seguem a função escalar, que mantém o mesmo tratamento (erro) do datetime_from_utc
+    if not utctimes or any(item.tzinfo not in (None, utc) for item in utctimes):
+        return [datetime_from_utc(item, str_zone) for item in utctimes]
+
+    values = _as_datetime64(utctimes)
+    index = _transition_index(values, str_zone)
+    tzinfos = _transition_tzinfos(str_zone)
+
+    local = (values + _transition_table(str_zone)[1][index]).tolist()
+    return [item.replace(tzinfo=tzinfos[position]) for item, position in zip(local, index.tolist())]
+
+
+def datetimes_to_utc(localtimes: list, zone: str = 'America/Sao_Paulo') -> list:
+    """
+    Converte uma lista de horários locais, de acordo com a zona de horário, para UTC
+
+    Com o numpy instalado, a conversão é feita pelo datetime64_to_utc (o localize do pytz só é usado nos horários
+    ambíguos ou inexistentes). Sem o numpy, cada horário passa pelo datetime_to_utc
+
+    :param localtimes:
+        Lista de horários locais
+    :param zone:
+        Fuso horário de origem
+    :return:
+        Lista de datetimes no fuso UTC
+    """
+    try:
+        _numpy()
+    except ImportError:
+        return [datetime_to_utc(item, zone) for item in localtimes]
+
+    if not localtimes:
+        return list()
+
+    # Assim como no datetime_to_utc, o fuso e as frações de segundo são desconsiderados
+    values = _as_datetime64(localtimes).astype('datetime64[s]').astype('datetime64[us]')
+    return [item.replace(tzinfo=utc) for item in datetime64_to_utc(values, zone).tolist()]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        raise ImportError('O pacote "numpy" é necessário para converter arrays de datetime64')
+
+    return numpy
+
+
+def _as_datetime64(values: list):
+    """
+    Array datetime64[us] com a data e hora de cada item, desconsiderando o fuso (exceto UTC, que não altera os campos)
+
+    A diferença para a época é calculada em um array de objetos, bem mais rápido que a conversão direta pelo numpy
+    """
+    np = _numpy()
+    tzinfos = {item.tzinfo for item in values}
+
+    if tzinfos == {utc}:
+        epoch = EPOCH_UTC
+    else:
+        epoch = EPOCH
+        if tzinfos != {None}:
+            values = [item.replace(tzinfo=None) for item in values]
+
+    return ((np.array(values, dtype=object) - epoch) // ONE_MICROSECOND).astype('int64').view('datetime64[us]')
+
+
+@lru_cache(maxsize=None)
+def _transition_table(str_zone: str) -> tuple:
+    """
+    Tabela de transições do fuso horário: instantes UTC de cada transição e o deslocamento vigente a partir dele
+
+    :param str_zone:
+        Nome do fuso horário
+    :return:
+        Tupla (array datetime64[us] das transições, array timedelta64[us] dos deslocamentos)
+    """
+    np = _numpy()
+    zone = get_timezone(str_zone)
+
+    transitions = getattr(zone, '_utc_transition_times', None)
+
+    if not transitions:
+        # Fusos sem transições (UTC e StaticTzInfo) possuem um único deslocamento
+        transitions = [datetime(1, 1, 1)]
+        offsets = [zone.utcoffset(datetime(1970, 1, 1))]
+    else:
+        offsets = [info[0] for info in zone._transition_info]
+
+    return np.array(transitions, dtype='datetime64[us]'), np.array(offsets, dtype='timedelta64[us]')
+
+
+@lru_cache(maxsize=None)
+def _transition_tzinfos(str_zone: str) -> tuple:
+    """
+    Instâncias de tzinfo (pytz) de cada posição da tabela de transições, as mesmas atribuídas pelo fromutc
+
+    :param str_zone:
+        Nome do fuso horário
+    :return:
+        Tupla com o tzinfo vigente a partir de cada transição
+    """
+    zone = get_timezone(str_zone)
+
+    if not getattr(zone, '_utc_transition_times', None):
+        return zone,
+
+    return tuple(zone._tzinfos[info] for info in zone._transition_info)
+
+
+def _transition_index(utctimes, str_zone: str):
+    """Posição, na tabela de transições, da transição vigente em cada horário UTC (mesmo critério do fromutc)"""
+    np = _numpy()
+    transitions, _ = _transition_table(str_zone)
+    return np.maximum(np.searchsorted(transitions, utctimes, side='right') - 1, 0)
+
+
+def _offsets_at(utctimes, str_zone: str):
+    return _transition_table(str_zone)[1][_transition_index(utctimes, str_zone)]
+
+
+def datetime64_from_utc(utctimes, str_zone: str = 'America/Sao_Paulo'):
+    """
+    Converte um array de horários UTC (datetime64) para a hora local da zona informada, de forma vetorizada
+
+    :param utctimes:
+        Array (ou lista) de horários UTC sem fuso
+    :param str_zone:
+        Fuso horário de destino
+    :return:
+        Array datetime64[us] com os horários locais sem fuso
+    """
+    np = _numpy()
+    values = np.asarray(utctimes, dtype='datetime64[us]')
+    return values + _offsets_at(values, str_zone)
+
+
+def datetime64_to_utc(localtimes, zone: str = 'America/Sao_Paulo'):
+    """
+    Converte um array de horários locais (datetime64) da zona informada para UTC, de forma vetorizada
+
+    Horários ambíguos ou inexistentes (próximos às transições de horário de verão) são resolvidos pela função
+    escalar, com o mesmo critério do datetime_to_utc. Ao contrário dela, as frações de segundo são preservadas
+
+    :param localtimes:
+        Array (ou lista) de horários locais sem fuso
+    :param zone:
+        Fuso horário de origem
+    :return:
+        Array datetime64[us] com os horários UTC sem fuso
+    """
+    np = _numpy()
+    values = np.asarray(localtimes, dtype='datetime64[us]')
+
+    # Mesmos candidatos considerados pelo pytz no localize: o deslocamento vigente um dia antes e um dia depois
+    before = _offsets_at(values - np.timedelta64(ONE_DAY), zone)
+    after = _offsets_at(values + np.timedelta64(ONE_DAY), zone)
+
+    utc_before, utc_after = values - before, values - after
+    valid_before = _offsets_at(utc_before, zone) == before
+    valid_after = _offsets_at(utc_after, zone) == after
+
+    result = np.where(valid_before, utc_before, utc_after)
+
+    resolved = (valid_before ^ valid_after) | (valid_before & valid_after & (utc_before == utc_after))
+    pending = ~resolved & ~np.isnat(values)
+
+    if pending.any():
+        fuso = get_timezone(zone)
+        result[pending] = [
+            fuso.localize(item).astimezone(utc).replace(tzinfo=None) for item in values[pending].astype(datetime)
+        ]
+
+    return result
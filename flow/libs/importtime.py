@@ -0,0 +1,62 @@
+"""
+Relatório do tempo de importação dos módulos (baseado no `python -X importtime`)
+
+Uso:
+    $ python -m flow.libs.importtime flow.rpc 20
+"""
+import subprocess
+import sys
+
+
+def import_time_report(module: str, limit: int = 20) -> list:
+    """
+    Importa o módulo em um novo interpretador com `-X importtime` e retorna os módulos mais custosos
+
+    :param module: Módulo a ser importado
+    :param limit: Quantidade de módulos no relatório
+    :return: Lista de tuplas (módulo, tempo próprio em us, tempo acumulado em us), ordenada pelo tempo acumulado
+    """
+
+    if sys.version_info < (3, 7):
+        raise RuntimeError('O relatório de importação depende do "-X importtime" (Python 3.7 ou superior)')
+
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+
+    return parse_import_time(process.stderr)[:limit]
+
+
+def parse_import_time(output: str) -> list:
+    """
+    Interpreta a saída do `-X importtime`
+
+    :param output: Saída de erro do interpretador
+    :return: Lista de tuplas (módulo, tempo próprio em us, tempo acumulado em us), ordenada pelo tempo acumulado
+    """
+
+    report = list()
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        report.append((name.strip(), int(self_time), int(cumulative)))
+
+    report.sort(key=lambda item: item[2], reverse=True)
+    return report
+
+
+def main(argv: list):
+    module = argv[0] if argv else 'flow.rpc'
+    limit = int(argv[1]) if len(argv) > 1 else 20
+
+    print(f'{"acumulado (ms)":>15} {"próprio (ms)":>13}  módulo')
+    for name, self_time, cumulative in import_time_report(module, limit):
+        print(f'{cumulative / 1000:>15.1f} {self_time / 1000:>13.1f}  {name}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,7 +1,17 @@
+import os
+
 from nameko.rpc import rpc
 from nameko.standalone.rpc import ClusterRpcProxy
+from nameko.timer import timer
 
 from flow.business.repository.journey_customer_repository import JourneyCustomerRepository
+from flow.rpc.warm_up import WarmUp
+from flow.rpc.write_behind import WriteBehindProvider
+
+
+def is_write_behind_enabled() -> bool:
+    """Indica se a inserção de JourneyCustomer é feita em modo write-behind (Redis Stream + flusher)"""
+    return os.environ.get('JOURNEY_CUSTOMER_WRITE_BEHIND', 'false').lower() == 'true'
 
 
 class JourneyFlowRpc:
@@ -11,6 +21,10 @@ class JourneyFlowRpc:
 
     name = 'journey_flow'
 
+    warm_up = WarmUp(repositories=[JourneyCustomerRepository], types_in_memory=['STATE'])
+
+    journey_customer_writer = WriteBehindProvider(JourneyCustomerRepository)
+
     @rpc
     def navigate(self, journey_instance_id: str):
         print(f'Sinalizando avanço de navegação para o JourneyInstanceID: [{journey_instance_id}]')
@@ -32,10 +46,25 @@ class JourneyFlowRpc:
             'data': journey_data
         }
 
-        res = JourneyCustomerRepository().insert_one(data)
+        if is_write_behind_enabled():
+            res = self.journey_customer_writer.enqueue(data)
+        else:
+            res = JourneyCustomerRepository().insert_one(data)
         journey_instance_id = res['_id']
 
         print(f'JourneyInstanceID [{journey_instance_id}] Inserido. Relacionando a Jornada [{journey_name}] com o '
               f'Customer [{shelf_id}]')
 
         return {'journey_instance_id': journey_instance_id}
+
+    @timer(interval=1)
+    def flush_journey_customer(self):
+        if not is_write_behind_enabled():
+            return
+
+        while self.journey_customer_writer.flush()['flushed']:
+            pass
+
+    @rpc
+    def journey_customer_write_behind_lag(self):
+        return self.journey_customer_writer.lag()
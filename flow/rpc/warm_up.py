@@ -0,0 +1,33 @@
+from nameko.extensions import DependencyProvider
+
+from flow.libs.databases.warm_up import warm_up_storage, warm_up_in_memory
+
+
+class WarmUp(DependencyProvider):
+    """
+    Dependência responsável por preparar as conexões na inicialização do serviço
+
+    O setup das extensões é executado antes do início dos entrypoints, portanto o serviço só passa a consumir as
+    mensagens do broker depois das conexões abertas, índices garantidos e caches carregados
+    """
+
+    def __init__(self, repositories: list = None, types_in_memory: list = None):
+        """
+        Inicialização do objeto
+
+        :param repositories: Lista de classes de repositório a serem preparadas
+        :param types_in_memory: Lista com os tipos de conexão in memory a serem preparados
+        """
+
+        self.repositories = repositories or list()
+        self.types_in_memory = types_in_memory or list()
+
+    def setup(self):
+        elapsed = warm_up_storage(self.repositories)
+        elapsed.update(warm_up_in_memory(self.types_in_memory))
+
+        for name, seconds in elapsed.items():
+            print(f'Warm up de [{name}] concluído em [{seconds * 1000:.1f}] ms')
+
+    def get_dependency(self, worker_ctx):
+        return None
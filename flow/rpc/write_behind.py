@@ -0,0 +1,30 @@
+from nameko.extensions import DependencyProvider
+
+from flow.libs.databases.storage.write_behind import WriteBehind
+
+
+class WriteBehindProvider(DependencyProvider):
+    """
+    Dependência que mantém um único WriteBehind por processo do serviço
+
+    O WriteBehind é criado no setup e compartilhado entre os workers, portanto o consumer group é garantido apenas no
+    primeiro flush do processo
+    """
+
+    def __init__(self, repository_class: type, **options):
+        """
+        Inicialização do objeto
+
+        :param repository_class: Classe do repositório de destino (derivada de CrudBase)
+        :param options: Parâmetros nomeados do WriteBehind (group, consumer, min_idle_time, max_deliveries)
+        """
+
+        self.repository_class = repository_class
+        self.options = options
+        self.writer = None
+
+    def setup(self):
+        self.writer = WriteBehind(self.repository_class(), **self.options)
+
+    def get_dependency(self, worker_ctx):
+        return self.writer
@@ -10,10 +10,38 @@ until nc -z ${STORAGE_CRUD_HOST} ${STORAGE_CRUD_PORT}; do
     sleep 1
 done
 
-until nc -z ${IN_MEMORY_STATE_HOST} ${IN_MEMORY_STATE_PORT}; do
-    echo "$(date) - waiting for state database..."
-    sleep 1
+# Nós (host:port) de um tipo de conexão in memory, com a mesma regra do _in_memory_nodes do connection_builder:
+# IN_MEMORY_<TYPE>_HOSTS separado por vírgula ou, quando não informado, IN_MEMORY_<TYPE>_HOST e IN_MEMORY_<TYPE>_PORT
+in_memory_nodes() {
+    local hosts="IN_MEMORY_$1_HOSTS" host="IN_MEMORY_$1_HOST" port="IN_MEMORY_$1_PORT" node
+
+    if [ -z "${!hosts}" ]; then
+        echo "${!host:-192.168.0.14}:${!port:-6379}"
+        return
+    fi
+
+    for node in ${!hosts//,/ }; do
+        case "${node}" in
+            *:*) echo "${node}" ;;
+            *) echo "${node}:6379" ;;
+        esac
+    done
+}
+
+for node in $(in_memory_nodes STATE); do
+    until nc -z "${node%:*}" "${node##*:}"; do
+        echo "$(date) - waiting for state database ${node}..."
+        sleep 1
+    done
 done
 
+if [ "${IMPORT_TIME_REPORT}" = "true" ]; then
+    if python -c 'import sys; sys.exit(sys.version_info < (3, 7))'; then
+        python -m flow.libs.importtime flow.rpc
+    else
+        echo "Import time report skipped: requires Python 3.7+ ($(python --version 2>&1))."
+    fi
+fi
+
 echo Starting Nameko.
 exec nameko run --config flow/config.yaml flow.rpc
\ No newline at end of file
@@ -0,0 +1,55 @@
+import fakeredis
+import mongomock
+import pytest
+
+from flow.libs.databases import connection_builder
+from tests.fakes import FakeAsyncCollection, FakeAsyncRedis, FakeStreamRedis
+
+IN_MEMORY_NODES = ['node1:6379', 'node2:6379', 'node3:6379']
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Substitui as conexões do storage (síncrona e assíncrona) por coleções do mongomock"""
+    client = mongomock.MongoClient()
+
+    def get_storage_connection(type_connection: str, database: str, subject: str):
+        return client[database][subject]
+
+    def get_async_storage_connection(type_connection: str, database: str, subject: str):
+        return FakeAsyncCollection(client[database][subject])
+
+    monkeypatch.setattr('flow.libs.databases.storage.crud_base.get_storage_connection', get_storage_connection)
+    monkeypatch.setattr('flow.libs.databases.storage.async_crud_base.get_async_storage_connection',
+                        get_async_storage_connection)
+    return client
+
+
+@pytest.fixture
+def in_memory(monkeypatch):
+    """
+    Configura três nós in memory (fakeredis) para todos os tipos de conexão
+
+    :return: Dicionário com o nó e o seu FakeRedis
+    """
+    servers = {node: fakeredis.FakeRedis(server=fakeredis.FakeServer()) for node in IN_MEMORY_NODES}
+
+    async def get_async_in_memory_pool(node: str):
+        return FakeAsyncRedis(servers[node])
+
+    for type_connection in ('STATE', 'CACHE'):
+        monkeypatch.setenv(f'IN_MEMORY_{type_connection}_HOSTS', ','.join(IN_MEMORY_NODES))
+
+    monkeypatch.setattr(connection_builder, '_in_memory_rings', dict())
+    monkeypatch.setattr(connection_builder, '_get_in_memory_server', servers.get)
+    monkeypatch.setattr(connection_builder, '_get_async_in_memory_pool', get_async_in_memory_pool)
+    return servers
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    """Substitui a conexão usada pelo write-behind por um Redis Streams em memória"""
+    server = FakeStreamRedis()
+    monkeypatch.setattr('flow.libs.databases.storage.write_behind.get_in_memory_connection',
+                        lambda type_connection, key=None: server)
+    return server
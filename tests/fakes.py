@@ -0,0 +1,235 @@
+"""
+Adaptadores assíncronos sobre o mongomock e o fakeredis, com a mesma interface usada do motor e do aioredis 1.x, e
+um Redis Streams em memória
+"""
+import asyncio
+from time import time
+
+from redis.exceptions import ResponseError
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _as_coroutine(method):
+    async def call(*args, **kwargs):
+        return method(*args, **kwargs)
+
+    return call
+
+
+class FakeAsyncCursor(object):
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.iterator = None
+
+    def sort(self, *args, **kwargs):
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, number: int):
+        self.cursor = self.cursor.skip(number)
+        return self
+
+    def limit(self, number: int):
+        self.cursor = self.cursor.limit(number)
+        return self
+
+    def __aiter__(self):
+        self.iterator = iter(self.cursor)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeAsyncCollection(object):
+    """Coleção do motor sobre uma coleção do mongomock"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        return FakeAsyncCursor(self.collection.find(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return _as_coroutine(getattr(self.collection, name))
+
+
+class FakeAsyncPipeline(object):
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+    def hmset_dict(self, key, data):
+        self.pipe.hmset(key, data)
+
+    def __getattr__(self, name):
+        return getattr(self.pipe, name)
+
+    async def execute(self):
+        return self.pipe.execute()
+
+
+class FakeAsyncRedis(object):
+    """Pool do aioredis 1.x sobre um FakeRedis"""
+
+    closed = False
+
+    def __init__(self, server):
+        self.server = server
+
+    async def hmget(self, key, field, *fields):
+        return self.server.hmget(key, [field, *fields])
+
+    async def mget(self, key, *keys):
+        return self.server.mget([key, *keys])
+
+    def pipeline(self):
+        return FakeAsyncPipeline(self.server.pipeline())
+
+    def __getattr__(self, name):
+        return _as_coroutine(getattr(self.server, name))
+
+
+def _stream_id(message_id) -> tuple:
+    if isinstance(message_id, bytes):
+        message_id = message_id.decode()
+    milliseconds, sequence = message_id.split('-')
+    return int(milliseconds), int(sequence)
+
+
+def _encode(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeStreamPipeline(object):
+
+    def __init__(self, server):
+        self.server = server
+        self.commands = list()
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.server, name), args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        commands, self.commands = self.commands, list()
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+class FakeStreamRedis(object):
+    """
+    Subconjunto dos comandos de Redis Streams usados pelo write-behind (o fakeredis 1.x não suporta streams)
+
+    O relógio usado no tempo ocioso das mensagens pendentes pode ser avançado com `advance`
+    """
+
+    def __init__(self):
+        self.streams = dict()
+        self.groups = dict()
+        self.offset = 0
+        self.sequence = 0
+
+    def now(self) -> int:
+        return int(time() * 1000) + self.offset
+
+    def advance(self, milliseconds: int):
+        self.offset += milliseconds
+
+    def pipeline(self):
+        return FakeStreamPipeline(self)
+
+    def exists(self, name: str) -> int:
+        return int(name in self.streams)
+
+    def xadd(self, name: str, fields: dict) -> bytes:
+        self.sequence += 1
+        message_id = f'{int(time() * 1000)}-{self.sequence}'.encode()
+        self.streams.setdefault(name, dict())[message_id] = {_encode(k): _encode(v) for k, v in fields.items()}
+        return message_id
+
+    def xlen(self, name: str) -> int:
+        return len(self.streams.get(name, dict()))
+
+    def xrange(self, name: str, count: int = None) -> list:
+        return list(self.streams.get(name, dict()).items())[:count]
+
+    def xdel(self, name: str, *ids) -> int:
+        return len([self.streams[name].pop(message_id) for message_id in ids if message_id in self.streams[name]])
+
+    def xgroup_create(self, name: str, groupname: str, id: str = '$', mkstream: bool = False):
+        if name not in self.streams and not mkstream:
+            raise ResponseError('ERR The XGROUP subcommand requires the key to exist')
+        if (name, groupname) in self.groups:
+            raise ResponseError('BUSYGROUP Consumer Group name already exists')
+
+        self.streams.setdefault(name, dict())
+        self.groups[(name, groupname)] = {'last': (0, 0), 'pending': dict()}
+
+    def xreadgroup(self, groupname: str, consumername: str, streams: dict, count: int = None, block: int = None):
+        response = list()
+
+        for name in streams:
+            group = self.groups[(name, groupname)]
+            entries = [item for item in self.streams[name].items() if _stream_id(item[0]) > group['last']][:count]
+
+            for message_id, _ in entries:
+                group['last'] = _stream_id(message_id)
+                group['pending'][message_id] = [consumername, self.now(), 1]
+
+            if entries:
+                response.append([name.encode(), entries])
+
+        return response
+
+    def xpending(self, name: str, groupname: str) -> dict:
+        if (name, groupname) not in self.groups:
+            raise ResponseError(f"NOGROUP No such key '{name}' or consumer group '{groupname}'")
+
+        return {'pending': len(self.groups[(name, groupname)]['pending'])}
+
+    def xpending_range(self, name: str, groupname: str, min: str, max: str, count: int) -> list:
+        pending = self.groups[(name, groupname)]['pending']
+        return [
+            {
+                'message_id': message_id,
+                'consumer': consumer.encode(),
+                'time_since_delivered': self.now() - delivered_at,
+                'times_delivered': times_delivered
+            }
+            for message_id, (consumer, delivered_at, times_delivered) in sorted(
+                pending.items(), key=lambda item: _stream_id(item[0])
+            )[:count]
+        ]
+
+    def xclaim(self, name: str, groupname: str, consumername: str, min_idle_time: int, message_ids: list) -> list:
+        pending = self.groups[(name, groupname)]['pending']
+        response = list()
+
+        for message_id in message_ids:
+            item = pending.get(message_id)
+            if item is None or self.now() - item[1] < min_idle_time:
+                continue
+
+            pending[message_id] = [consumername, self.now(), item[2] + 1]
+            fields = self.streams[name].get(message_id)
+            response.append((message_id, fields) if fields is not None else (None, None))
+
+        return response
+
+    def xack(self, name: str, groupname: str, *ids) -> int:
+        pending = self.groups[(name, groupname)]['pending']
+        return len([pending.pop(message_id) for message_id in ids if message_id in pending])
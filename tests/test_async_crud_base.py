@@ -0,0 +1,140 @@
+import inspect
+
+import pytest
+from werkzeug.exceptions import BadRequest, Forbidden, NotFound
+
+from flow.libs.databases.in_memory.cache import AsyncCache
+from flow.libs.databases.storage.async_crud_base import AsyncCrudBase
+from flow.libs.databases.storage.crud_base import CrudBase
+from flow.libs.databases.storage.multi_find import multi_find
+from flow.libs.databases.storage.resource import storage_resource
+from flow.libs.databases.storage.write_behind import WriteBehind
+from flow.libs.databases.warm_up import warm_up_storage
+from tests.fakes import run
+
+
+@storage_resource(
+    database='test',
+    subject='async_customer',
+    verify_insert=True,
+    key_fields='shelf_id',
+    schema={'shelf_id': str, 'step': int}
+)
+class AsyncCustomerRepository(AsyncCrudBase):
+    pass
+
+
+class CustomerCache(AsyncCache):
+    __slots__ = ('shelf_id',)
+
+    def __init__(self, shelf_id: str):
+        super().__init__(subject='customer')
+        self.shelf_id = shelf_id
+
+
+@storage_resource(database='test', subject='async_cached_customer')
+class AsyncCachedCustomerRepository(AsyncCrudBase):
+
+    async def clear_cache(self, old_data: dict, is_multi: bool):
+        await CustomerCache(old_data.get('shelf_id')).delete()
+
+
+def test_async_crud_base_is_not_a_crud_base():
+    assert not issubclass(AsyncCrudBase, CrudBase)
+
+
+def test_async_crud_base_storage_methods_are_coroutines():
+    for name in ('prepare_insert', 'insert_one', 'insert_many', 'find_many', 'find_one', 'find_records',
+                 'find_columns', 'update_one', 'remove_one', 'remove_many', 'ensure_indexes', 'clear_cache',
+                 'prime_cache'):
+        assert inspect.iscoroutinefunction(getattr(AsyncCrudBase, name)), name
+
+    assert inspect.isasyncgenfunction(AsyncCrudBase.iter_many)
+
+
+def test_insert_one_and_find_one(storage):
+    repository = AsyncCustomerRepository()
+
+    res = run(repository.insert_one({'shelf_id': '1', 'step': 1}))
+    item = run(repository.find_one(res['_id']))
+
+    assert item['_id'] == res['_id']
+    assert item['shelf_id'] == '1'
+    assert '__inserted__' in item
+
+
+def test_insert_one_verifies_key_fields(storage):
+    repository = AsyncCustomerRepository()
+    run(repository.insert_one({'shelf_id': '1'}))
+
+    with pytest.raises(Forbidden):
+        run(repository.insert_one({'shelf_id': '1'}))
+
+
+def test_find_one_not_found(storage):
+    with pytest.raises(NotFound):
+        run(AsyncCustomerRepository().find_one('5f0000000000000000000000'))
+
+
+def test_insert_many_iter_many_and_find_many(storage):
+    repository = AsyncCustomerRepository()
+    res = run(repository.insert_many([{'shelf_id': str(index), 'step': index} for index in range(3)]))
+
+    async def collect():
+        return [item async for item in repository.iter_many(sorting=['step#DESC'])]
+
+    assert len(res['_ids']) == 3
+    assert [item['step'] for item in run(collect())] == [2, 1, 0]
+    assert run(repository.find_many())['total_records'] == 3
+
+    page = run(repository.find_many(page_number=2, per_page=2, sorting=['step#ASC']))
+    assert page['page_records'] == 1
+    assert page['total_records'] == 3
+    assert page['total_pages'] == 2
+    assert page['list'][0]['step'] == 2
+
+    with pytest.raises(BadRequest):
+        run(repository.find_many(page_number=3, per_page=2))
+
+
+def test_find_records_and_find_columns(storage):
+    repository = AsyncCustomerRepository()
+    run(repository.insert_many([{'shelf_id': str(index), 'step': index} for index in range(3)]))
+
+    records = run(repository.find_records(sorting=['step#ASC']))
+    batch = run(repository.find_columns(sorting=['step#ASC']))
+
+    assert [item.step for item in records] == [0, 1, 2]
+    assert list(batch) == records
+
+
+def test_update_and_remove(storage):
+    repository = AsyncCustomerRepository()
+    _id = run(repository.insert_one({'shelf_id': '1', 'step': 1}))['_id']
+    run(repository.insert_one({'shelf_id': '2', 'step': 2}))
+
+    assert run(repository.update_one(_id, {'step': 5})) == {'matched': 1, 'updated': 1}
+    assert run(repository.find_one(_id))['step'] == 5
+    assert run(repository.remove_one(_id)) == {'deleted': 1}
+    assert run(repository.remove_many()) == {'deleted': 1}
+
+
+def test_clear_cache_is_awaited(storage, in_memory):
+    repository = AsyncCachedCustomerRepository()
+    _id = run(repository.insert_one({'shelf_id': '1'}))['_id']
+
+    for operation in (lambda: repository.update_one(_id, {'step': 1}), lambda: repository.remove_one(_id)):
+        run(CustomerCache('1').set_value({'step': 0}))
+        run(operation())
+        assert run(CustomerCache('1').get_value()) is None
+
+
+def test_sync_helpers_reject_async_repositories():
+    with pytest.raises(BadRequest):
+        multi_find({'customer': (AsyncCustomerRepository(), 'find_one', {'_id': '1'})})
+
+    with pytest.raises(TypeError):
+        WriteBehind(AsyncCustomerRepository())
+
+    with pytest.raises(TypeError):
+        warm_up_storage([AsyncCustomerRepository])
@@ -0,0 +1,81 @@
+import pytest
+
+from flow.libs.databases.in_memory.cache import AsyncCache, Cache
+from flow.libs.databases.in_memory.state import AsyncState, State
+from tests.fakes import run
+
+
+class CustomerCache(AsyncCache):
+    __slots__ = ('customer_id',)
+
+    def __init__(self, customer_id: str):
+        super().__init__(subject='customer')
+        self.customer_id = customer_id
+
+
+class JourneyState(AsyncState):
+    __slots__ = ('journey_instance_id',)
+
+    def __init__(self, journey_instance_id: str):
+        super().__init__()
+        self.journey_instance_id = journey_instance_id
+
+
+class SyncJourneyState(State):
+    __slots__ = ('journey_instance_id',)
+
+    def __init__(self, journey_instance_id: str):
+        super().__init__()
+        self.journey_instance_id = journey_instance_id
+
+
+def test_async_classes_share_key_building():
+    assert str(JourneyState('1')) == 'STATE:NA:1'
+    assert str(JourneyState('1')) == str(SyncJourneyState('1'))
+    assert str(CustomerCache('1')) == 'CACHE:customer:1'
+
+
+def test_async_classes_are_not_sync_classes():
+    assert not isinstance(CustomerCache('1'), Cache)
+    assert not isinstance(JourneyState('1'), State)
+
+    with pytest.raises(AttributeError):
+        CustomerCache('1').connection
+
+    with pytest.raises(AttributeError):
+        JourneyState('1').connection
+
+
+def test_async_cache(in_memory):
+    cache = CustomerCache('1')
+    cache.ttl = 60
+
+    run(cache.set_value({'name': 'Maria'}))
+    assert run(cache.get_value()) == {'name': 'Maria'}
+
+    run(cache.delete())
+    assert run(cache.get_value()) is None
+
+
+def test_async_state(in_memory):
+    state = JourneyState('1')
+    state.ttl = 60
+
+    run(state.set_value({'step': '1', 'status': 'open'}))
+    assert run(state.exists())
+    assert run(state.get_value()) == {'step': '1', 'status': 'open'}
+
+    run(state.set_field('step', '2'))
+    assert run(state.get_field('step')) == '2'
+    assert run(state.get_fields(['step', 'missing'])) == {'step': '2', 'missing': None}
+
+    run(state.set_value({'status': 'closed'}))
+    assert run(state.get_value()) == {'status': 'closed'}
+
+    run(state.reset_value())
+    assert not run(state.exists())
+
+
+def test_async_and_sync_state_share_values(in_memory):
+    SyncJourneyState('1').set_value({'step': '3'})
+    assert run(JourneyState('1').get_value()) == {'step': '3'}
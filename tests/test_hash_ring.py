@@ -0,0 +1,68 @@
+from collections import Counter
+
+import pytest
+
+from flow.libs.databases.hash_ring import HashRing
+
+KEYS = [f'STATE:NA:{index}' for index in range(20000)]
+
+
+def test_empty_ring():
+    with pytest.raises(ValueError):
+        HashRing().get_node('key')
+
+
+def test_single_node():
+    ring = HashRing(['node1:6379'])
+    assert {ring.get_node(key) for key in KEYS[:100]} == {'node1:6379'}
+
+
+def test_get_node_is_deterministic():
+    first = HashRing(['a', 'b', 'c'])
+    second = HashRing(['c', 'b', 'a'])
+    assert all(first.get_node(key) == second.get_node(key) for key in KEYS[:1000])
+
+
+def test_keys_are_balanced_between_nodes():
+    ring = HashRing(['a', 'b', 'c'])
+    counter = Counter(ring.get_node(key) for key in KEYS)
+
+    assert set(counter) == {'a', 'b', 'c'}
+    assert all(0.25 < count / len(KEYS) < 0.42 for count in counter.values())
+
+
+def test_add_node_moves_about_one_nth_of_keys():
+    ring = HashRing(['a', 'b', 'c'])
+    before = {key: ring.get_node(key) for key in KEYS}
+
+    ring.add_node('d')
+    moved = [key for key in KEYS if ring.get_node(key) != before[key]]
+
+    assert 0.15 < len(moved) / len(KEYS) < 0.35
+    assert {ring.get_node(key) for key in moved} == {'d'}
+
+
+def test_remove_node_moves_only_its_keys():
+    ring = HashRing(['a', 'b', 'c', 'd'])
+    before = {key: ring.get_node(key) for key in KEYS}
+
+    ring.remove_node('d')
+
+    assert all(ring.get_node(key) == node for key, node in before.items() if node != 'd')
+    assert 'd' not in {ring.get_node(key) for key in KEYS}
+
+
+def test_add_and_remove_are_idempotent():
+    ring = HashRing(['a', 'b'])
+    ring.add_node('a')
+    ring.remove_node('z')
+    assert ring.nodes == ['a', 'b']
+
+
+def test_group_keeps_order_per_node():
+    ring = HashRing(['a', 'b', 'c'])
+    groups = ring.group(KEYS[:300])
+
+    assert sorted(key for keys in groups.values() for key in keys) == sorted(KEYS[:300])
+    for node, keys in groups.items():
+        assert keys == [key for key in KEYS[:300] if ring.get_node(key) == node]
@@ -0,0 +1,111 @@
+from flow.libs.databases import connection_builder
+from flow.libs.databases.connection_builder import get_in_memory_ring
+from flow.libs.databases.in_memory.cache import AsyncCache, Cache
+from flow.libs.databases.in_memory.state import AsyncState, State
+from tests.fakes import run
+
+
+class CustomerCache(Cache):
+    __slots__ = ('customer_id',)
+
+    def __init__(self, customer_id: str):
+        super().__init__(subject='customer')
+        self.customer_id = customer_id
+
+
+class AsyncCustomerCache(AsyncCache):
+    __slots__ = ('customer_id',)
+
+    def __init__(self, customer_id: str):
+        super().__init__(subject='customer')
+        self.customer_id = customer_id
+
+
+class JourneyState(State):
+    __slots__ = ('journey_instance_id',)
+
+    def __init__(self, journey_instance_id: str):
+        super().__init__()
+        self.journey_instance_id = journey_instance_id
+
+
+class AsyncJourneyState(AsyncState):
+    __slots__ = ('journey_instance_id',)
+
+    def __init__(self, journey_instance_id: str):
+        super().__init__()
+        self.journey_instance_id = journey_instance_id
+
+
+def stored_nodes(in_memory: dict, key: str) -> list:
+    return [node for node, server in in_memory.items() if server.exists(key)]
+
+
+def test_in_memory_nodes(monkeypatch):
+    monkeypatch.setenv('IN_MEMORY_TEST_HOSTS', 'redis1:6380, redis2')
+    assert connection_builder._in_memory_nodes('TEST') == ['redis1:6380', 'redis2:6379']
+
+    monkeypatch.delenv('IN_MEMORY_TEST_HOSTS')
+    monkeypatch.setenv('IN_MEMORY_TEST_HOST', 'redis3')
+    monkeypatch.setenv('IN_MEMORY_TEST_PORT', '6381')
+    assert connection_builder._in_memory_nodes('TEST') == ['redis3:6381']
+
+
+def test_keys_are_routed_to_their_node(in_memory):
+    ring = get_in_memory_ring('CACHE')
+
+    for index in range(30):
+        cache = CustomerCache(str(index))
+        cache.set_value({'index': index})
+
+        assert stored_nodes(in_memory, str(cache)) == [ring.get_node(str(cache))]
+        assert cache.get_value() == {'index': index}
+
+    assert all(server.dbsize() > 0 for server in in_memory.values())
+
+
+def test_wildcard_delete_reaches_all_nodes(in_memory):
+    for index in range(30):
+        CustomerCache(str(index)).set_value({'index': index})
+
+    CustomerCache('*').delete()
+
+    assert all(server.dbsize() == 0 for server in in_memory.values())
+
+
+def test_cache_bulk_operations_are_grouped_by_node(in_memory):
+    caches = [CustomerCache(str(index)) for index in range(30)]
+    Cache.set_values([(cache, {'index': index}) for index, cache in enumerate(caches)])
+
+    ring = get_in_memory_ring('CACHE')
+    for cache in caches:
+        assert stored_nodes(in_memory, str(cache)) == [ring.get_node(str(cache))]
+
+    assert Cache.get_values(caches + [CustomerCache('missing')]) == [{'index': index} for index in range(30)] + [None]
+
+
+def test_state_bulk_operations_are_grouped_by_node(in_memory):
+    states = [JourneyState(str(index)) for index in range(30)]
+    for state in states:
+        state.ttl = 60
+
+    State.set_values([(state, {'step': str(index)}) for index, state in enumerate(states)])
+
+    ring = get_in_memory_ring('STATE')
+    for state in states:
+        assert stored_nodes(in_memory, str(state)) == [ring.get_node(str(state))]
+        assert in_memory[ring.get_node(str(state))].ttl(str(state)) > 0
+
+    assert State.get_values(states[:2] + [JourneyState('missing')]) == [{'step': '0'}, {'step': '1'}, None]
+
+
+def test_async_bulk_operations(in_memory):
+    caches = [AsyncCustomerCache(str(index)) for index in range(10)]
+    states = [AsyncJourneyState(str(index)) for index in range(10)]
+
+    run(AsyncCache.set_values([(cache, {'index': index}) for index, cache in enumerate(caches)]))
+    run(AsyncState.set_values([(state, {'step': str(index)}) for index, state in enumerate(states)]))
+
+    assert run(AsyncCache.get_values(caches)) == [{'index': index} for index in range(10)]
+    assert run(AsyncState.get_values(states)) == [{'step': str(index)} for index in range(10)]
+    assert Cache.get_values([CustomerCache(str(index)) for index in range(10)]) == run(AsyncCache.get_values(caches))
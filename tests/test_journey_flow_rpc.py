@@ -0,0 +1,64 @@
+import pytest
+
+try:
+    from nameko.testing.services import worker_factory
+    from flow.rpc.journey_flow_rpc import JourneyFlowRpc
+    from flow.rpc.write_behind import WriteBehindProvider
+except ImportError as ex:  # pragma: no cover
+    pytest.skip(f'nameko indisponível neste interpretador: {ex}', allow_module_level=True)
+
+from flow.business.repository.journey_customer_repository import JourneyCustomerRepository
+from flow.libs.databases.storage.write_behind import WriteBehind
+
+
+def collection(storage):
+    return storage['smart_journey']['journey_customer']
+
+
+@pytest.fixture
+def service(storage, stream):
+    return worker_factory(JourneyFlowRpc, journey_customer_writer=WriteBehind(JourneyCustomerRepository()))
+
+
+def test_join_customer_journey_inserts_directly(monkeypatch, storage, service):
+    monkeypatch.setenv('JOURNEY_CUSTOMER_WRITE_BEHIND', 'false')
+
+    res = service.join_customer_journey('onboarding', '1', {'step': 1})
+
+    assert collection(storage).count_documents({}) == 1
+    assert str(collection(storage).find_one()['_id']) == res['journey_instance_id']
+
+
+def test_join_customer_journey_write_behind(monkeypatch, storage, stream, service):
+    monkeypatch.setenv('JOURNEY_CUSTOMER_WRITE_BEHIND', 'true')
+
+    res = service.join_customer_journey('onboarding', '1', {'step': 1})
+
+    assert collection(storage).count_documents({}) == 0
+    assert service.journey_customer_write_behind_lag()['length'] == 1
+
+    service.flush_journey_customer()
+
+    assert str(collection(storage).find_one()['_id']) == res['journey_instance_id']
+    assert service.journey_customer_write_behind_lag()['length'] == 0
+
+
+def test_flush_journey_customer_disabled(monkeypatch, storage, stream, service):
+    monkeypatch.setenv('JOURNEY_CUSTOMER_WRITE_BEHIND', 'false')
+
+    service.flush_journey_customer()
+
+    assert not stream.groups
+
+
+def test_write_behind_provider_shares_one_writer_per_process(storage, stream):
+    provider = WriteBehindProvider(JourneyCustomerRepository, consumer='c1')
+    provider.setup()
+
+    writer = provider.get_dependency(worker_ctx=None)
+    writer.enqueue({'shelf_id': '1'})
+
+    assert provider.get_dependency(worker_ctx=None) is writer
+    assert writer.consumer == 'c1'
+    assert writer.flush() == {'flushed': 1, 'failed': 0}
+    assert collection(storage).count_documents({}) == 1
@@ -0,0 +1,82 @@
+from time import perf_counter, sleep
+
+import pytest
+from werkzeug.exceptions import BadRequest, NotFound
+
+from flow.libs.databases.storage.crud_base import CrudBase
+from flow.libs.databases.storage.multi_find import multi_find
+
+
+class SleepyRepository(CrudBase):
+    subject = 'sleepy'
+    database = 'test'
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def find_one(self, _id: str, projection: list=None) -> dict:
+        sleep(self.delay)
+        if _id == 'missing':
+            raise NotFound(f'Registro [{_id}] não localizado')
+        return {'_id': _id}
+
+    def find_many(self, query: dict=None, projection: list=None, page_number: int=None, per_page: int=None,
+                  sorting: list=None) -> dict:
+        sleep(self.delay)
+        return {'total_records': 0, 'list': []}
+
+
+def test_multi_find_runs_queries_concurrently():
+    queries = {
+        f'q{index}': (SleepyRepository(0.3), 'find_one', {'_id': str(index)}) for index in range(5)
+    }
+
+    start = perf_counter()
+    res = multi_find(queries)
+    elapsed = perf_counter() - start
+
+    assert elapsed < 0.3 * 2
+    assert set(res) == set(queries)
+    assert res['q3']['result'] == {'_id': '3'}
+    assert all(item['error'] is None and item['elapsed'] >= 0.3 for item in res.values())
+
+
+def test_multi_find_wall_clock_close_to_slowest_query():
+    queries = {
+        'fast': (SleepyRepository(0.05), 'find_many', {'query': {}}),
+        'slow': (SleepyRepository(0.4), 'find_one', {'_id': '1'})
+    }
+
+    start = perf_counter()
+    multi_find(queries)
+    elapsed = perf_counter() - start
+
+    assert 0.4 <= elapsed < 0.4 + 0.2
+
+
+def test_multi_find_reports_errors_per_query():
+    res = multi_find({
+        'ok': (SleepyRepository(0), 'find_one', {'_id': '1'}),
+        'missing': (SleepyRepository(0), 'find_one', {'_id': 'missing'})
+    })
+
+    assert res['ok']['error'] is None
+    assert res['missing']['result'] is None
+    assert isinstance(res['missing']['error'], NotFound)
+
+
+def test_multi_find_empty():
+    assert multi_find({}) == {}
+
+
+@pytest.mark.parametrize('query', [
+    (SleepyRepository(0), 'find_one'),
+    'find_one',
+    (SleepyRepository(0), 'find_one', {}, 'extra'),
+    (object(), 'find_one', {}),
+    (SleepyRepository(0), 'remove_many', {})
+])
+def test_multi_find_invalid_query(query):
+    with pytest.raises(BadRequest):
+        multi_find({'invalid': query})
@@ -0,0 +1,239 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from werkzeug.exceptions import BadRequest, Forbidden
+
+from flow.libs.databases.storage.crud_base import CrudBase
+from flow.libs.databases.storage.record import field_attribute, make_record_class, Record, RecordCodec, ColumnBatch
+from flow.libs.databases.storage.resource import storage_resource
+
+SCHEMA = {
+    'shelf_id': str,
+    'step': int,
+    'score': float,
+    'active': bool,
+    'data': dict,
+    '__inserted__.at': datetime
+}
+
+
+@storage_resource(database='test', subject='record_customer', schema=SCHEMA)
+class RecordCustomerRepository(CrudBase):
+    pass
+
+
+@storage_resource(database='test', subject='plain_customer')
+class PlainCustomerRepository(CrudBase):
+    pass
+
+
+def test_field_attribute():
+    assert field_attribute('shelf_id') == 'shelf_id'
+    assert field_attribute('__inserted__.at') == 'inserted_at'
+    assert field_attribute('data.customer.name') == 'data_customer_name'
+
+
+def test_make_record_class_includes_id():
+    record_class = make_record_class('CustomerRecord', {'shelf_id': str})
+
+    assert issubclass(record_class, Record)
+    assert record_class.__slots__ == ('shelf_id', '_id')
+    assert record_class.paths == (('shelf_id',), ('_id',))
+    assert record_class.types == (str, str)
+
+
+@pytest.mark.parametrize('schema', [
+    {'data.id': str, 'data_id': str},
+    {'__inserted__.at': datetime, 'inserted.at': datetime}
+])
+def test_make_record_class_rejects_duplicate_attributes(schema):
+    with pytest.raises(Forbidden):
+        make_record_class('CustomerRecord', schema)
+
+
+@pytest.mark.parametrize('path', ['1step', 'shelf-id', 'class', 'data.', '__private', 'schema', 'to_dict'])
+def test_make_record_class_rejects_invalid_attributes(path):
+    with pytest.raises(Forbidden):
+        make_record_class('CustomerRecord', {path: str})
+
+
+def test_storage_resource_rejects_invalid_schema_at_decoration():
+    with pytest.raises(Forbidden):
+        @storage_resource(database='test', subject='invalid', schema={'data.id': str, 'data_id': str})
+        class InvalidRepository(CrudBase):
+            pass
+
+
+def test_record():
+    record_class = make_record_class('CustomerRecord', {'shelf_id': str, 'step': int})
+
+    record = record_class('1', step=2)
+
+    assert record.shelf_id == '1'
+    assert record.step == 2
+    assert record._id is None
+    assert record.to_dict() == {'shelf_id': '1', 'step': 2, '_id': None}
+    assert record == record_class('1', 2, None)
+    assert record != record_class('1', 3, None)
+    assert repr(record) == "CustomerRecord(shelf_id='1', step=2, _id=None)"
+
+    with pytest.raises(AttributeError):
+        record.other = 1
+
+
+def test_record_codec():
+    codec = RecordCodec(RecordCustomerRepository.record_class)
+    _id = ObjectId()
+    inserted_at = datetime(2020, 1, 1)
+
+    record = codec.decode({
+        '_id': _id,
+        'shelf_id': '1',
+        'step': 2,
+        'data': {'name': 'journey'},
+        '__inserted__': {'at': inserted_at},
+        'other': 'ignored'
+    })
+
+    assert codec.projection == ['__inserted__', '_id', 'active', 'data', 'score', 'shelf_id', 'step']
+    assert record._id == str(_id)
+    assert record.shelf_id == '1'
+    assert record.step == 2
+    assert record.score is None
+    assert record.data == {'name': 'journey'}
+    assert record.inserted_at == inserted_at
+
+
+def test_record_codec_converts_values():
+    record = RecordCodec(RecordCustomerRepository.record_class).decode(
+        {'_id': 7, 'shelf_id': ObjectId('5f0000000000000000000000'), 'step': 2.0, 'score': 1, 'active': 1}
+    )
+
+    assert record._id == '7'
+    assert record.shelf_id == '5f0000000000000000000000'
+    assert record.step == 2 and isinstance(record.step, int)
+    assert record.score == 1.0 and isinstance(record.score, float)
+    assert record.active is True
+
+
+@pytest.mark.parametrize('document', [
+    {'step': 'x'},
+    {'shelf_id': 1},
+    {'data': ['a']},
+    {'__inserted__': {'at': '2020-01-01'}}
+])
+def test_record_codec_rejects_incompatible_values(document):
+    with pytest.raises(BadRequest):
+        RecordCodec(RecordCustomerRepository.record_class).decode(document)
+
+
+def test_record_codec_missing_nested_path():
+    record = RecordCodec(RecordCustomerRepository.record_class).decode({'__inserted__': 'not a document'})
+
+    assert record._id is None
+    assert record.inserted_at is None
+
+
+def test_column_batch():
+    batch = ColumnBatch(RecordCustomerRepository.record_class)
+    batch.extend([
+        {'_id': 'a', 'shelf_id': '1', 'step': 1, 'score': 0.5, 'active': True, 'data': {'name': 'x'}},
+        {'_id': 'b', 'shelf_id': '2'}
+    ])
+
+    assert len(batch) == 2
+    assert batch.columns['step'].typecode == 'q'
+    assert batch.columns['score'].typecode == 'd'
+    assert isinstance(batch.columns['shelf_id'], list)
+
+    assert batch.value('step', 0) == 1
+    assert batch.value('active', 0) is True
+    assert batch.value('step', 1) is None
+    assert batch.value('score', 1) is None
+    assert batch.value('active', 1) is None
+
+    records = list(batch)
+    assert records[0] == RecordCodec(RecordCustomerRepository.record_class).decode(
+        {'_id': 'a', 'shelf_id': '1', 'step': 1, 'score': 0.5, 'active': True, 'data': {'name': 'x'}}
+    )
+    assert records[1].shelf_id == '2'
+    assert records[1].step is None
+
+
+def test_column_batch_converts_values():
+    batch = ColumnBatch(RecordCustomerRepository.record_class)
+    batch.append({'step': 3.0, 'score': 2, 'active': 1})
+
+    assert batch.value('step', 0) == 3
+    assert isinstance(batch.value('step', 0), int)
+    assert batch.value('score', 0) == 2.0
+    assert batch.value('active', 0) is True
+
+
+@pytest.mark.parametrize('document', [
+    {'step': 3.5},
+    {'step': 2 ** 63},
+    {'step': '3'},
+    {'score': 'high'},
+    {'active': 2}
+])
+def test_column_batch_rejects_incompatible_values_keeping_columns_aligned(document):
+    batch = ColumnBatch(RecordCustomerRepository.record_class)
+    batch.append({'_id': 'a', 'shelf_id': '1', 'step': 1, 'score': 0.5, 'active': False})
+
+    with pytest.raises(BadRequest):
+        batch.append({'_id': 'b', 'shelf_id': '2', **document})
+
+    assert len(batch) == 1
+    assert all(len(column) == 1 for column in batch.columns.values())
+    assert all(len(mask) == 1 for mask in batch.missing.values())
+
+
+def test_find_records_and_find_columns(storage):
+    storage['test']['record_customer'].insert_many([
+        {'shelf_id': '2', 'step': 2.0, 'score': 1, 'active': True, 'data': {'a': 1}, 'other': 'x'},
+        {'shelf_id': '1', 'step': 1, 'data': {'a': 2}}
+    ])
+
+    repository = RecordCustomerRepository()
+
+    records = repository.find_records(sorting=['shelf_id#ASC'])
+    assert [record.shelf_id for record in records] == ['1', '2']
+    assert records[1].data == {'a': 1}
+    assert 'other' not in records[1].to_dict()
+
+    batch = repository.find_columns(query={'shelf_id': '2'})
+    assert len(batch) == 1
+    assert batch.value('step', 0) == 2
+    assert batch.value('score', 0) == 1.0
+    assert batch.record(0)._id == records[1]._id
+
+
+def test_find_records_and_find_columns_return_the_same_values(storage):
+    storage['test']['record_customer'].insert_one({'shelf_id': '1', 'step': 2.0, 'active': 1})
+    repository = RecordCustomerRepository()
+
+    record = repository.find_records()[0]
+
+    assert record == repository.find_columns().record(0)
+    assert (record.step, record.active) == (2, True)
+    assert isinstance(record.step, int)
+
+
+def test_find_records_and_find_columns_reject_incompatible_values(storage):
+    storage['test']['record_customer'].insert_one({'shelf_id': '1', 'step': 'x'})
+
+    with pytest.raises(BadRequest):
+        RecordCustomerRepository().find_records()
+
+    with pytest.raises(BadRequest):
+        RecordCustomerRepository().find_columns()
+
+
+def test_find_records_without_schema(storage):
+    with pytest.raises(Forbidden):
+        PlainCustomerRepository().find_records()
+
+    with pytest.raises(Forbidden):
+        PlainCustomerRepository().find_columns()
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pytz import utc
+
+from flow.libs.datetime import datetime_from_utc, datetime_to_utc, datetimes_from_utc, datetimes_to_utc, \
+    datetime64_from_utc, datetime64_to_utc, get_timezone
+
+np = pytest.importorskip('numpy')
+
+ZONES = ['America/Sao_Paulo', 'America/Santiago', 'America/New_York', 'Europe/Dublin', 'Europe/London',
+         'Australia/Lord_Howe', 'Asia/Kolkata', 'Etc/GMT+3', 'UTC']
+
+
+def sample(zone: str) -> list:
+    """Horários a cada 6 horas em 2015-2018 e a cada 15 minutos nas 6 horas em torno de cada transição"""
+    start, end = datetime(2015, 1, 1), datetime(2019, 1, 1)
+    values = [start + timedelta(hours=6 * index) for index in range(int((end - start).total_seconds() // 21600))]
+
+    for transition in getattr(get_timezone(zone), '_utc_transition_times', []):
+        if start <= transition < end:
+            values.extend(transition + timedelta(minutes=15 * index) for index in range(-12, 13))
+
+    return values
+
+
+@pytest.mark.parametrize('zone', ZONES)
+def test_datetime64_from_utc_matches_scalar(zone):
+    values = sample(zone)
+    expected = [datetime_from_utc(item, zone).replace(tzinfo=None) for item in values]
+
+    result = datetime64_from_utc(np.array(values, dtype='datetime64[us]'), zone)
+
+    assert result.astype(datetime).tolist() == expected
+
+
+@pytest.mark.parametrize('zone', ZONES)
+def test_datetime64_to_utc_matches_scalar(zone):
+    # Os horários da amostra também são usados como horário local, incluindo os ambíguos e inexistentes
+    values = sample(zone)
+    expected = [datetime_to_utc(item, zone).replace(tzinfo=None) for item in values]
+
+    result = datetime64_to_utc(np.array(values, dtype='datetime64[us]'), zone)
+
+    assert result.astype(datetime).tolist() == expected
+
+
+def test_datetime64_preserves_microseconds_and_nat():
+    values = np.array(['2018-11-04T00:30:00.123456', 'NaT'], dtype='datetime64[us]')
+
+    result = datetime64_to_utc(values, 'America/Sao_Paulo')
+
+    assert result[0] == np.datetime64('2018-11-04T03:30:00.123456')
+    assert np.isnat(result[1])
+    assert np.isnat(datetime64_from_utc(values, 'America/Sao_Paulo')[1])
+
+
+def same_datetimes(result: list, expected: list) -> bool:
+    """Mesmo instante, mesmos campos e mesmo tzinfo (pytz) de cada item"""
+    return [(item, item.replace(tzinfo=None), item.tzinfo) for item in result] == \
+        [(item, item.replace(tzinfo=None), item.tzinfo) for item in expected]
+
+
+@pytest.mark.parametrize('zone', ZONES)
+def test_datetimes_from_utc_matches_scalar(zone):
+    values = [item.replace(microsecond=123) for item in sample(zone)]
+    aware = [item.replace(tzinfo=utc) for item in values]
+
+    assert same_datetimes(datetimes_from_utc(values, zone), [datetime_from_utc(item, zone) for item in values])
+    assert same_datetimes(datetimes_from_utc(aware, zone), [datetime_from_utc(item, zone) for item in aware])
+
+
+@pytest.mark.parametrize('zone', ZONES)
+def test_datetimes_to_utc_matches_scalar(zone):
+    values = [item.replace(microsecond=123) for item in sample(zone)]
+
+    assert same_datetimes(datetimes_to_utc(values, zone), [datetime_to_utc(item, zone) for item in values])
+
+
+def test_list_conversions_with_mixed_tzinfo():
+    new_york = get_timezone('America/New_York')
+    values = [datetime(1960, 5, 5, 10, 20, 30, 999999), datetime(2018, 11, 4, 2, 30, tzinfo=utc)]
+
+    assert same_datetimes(datetimes_from_utc(values), [datetime_from_utc(item) for item in values])
+
+    values.append(new_york.localize(datetime(2019, 6, 1, 12)))
+    assert same_datetimes(datetimes_to_utc(values), [datetime_to_utc(item) for item in values])
+
+
+def test_datetimes_from_utc_rejects_other_timezones():
+    with pytest.raises(ValueError):
+        datetimes_from_utc([datetime(2020, 1, 1, tzinfo=get_timezone('America/New_York'))])
+
+
+def test_list_conversions_without_numpy(monkeypatch):
+    def _numpy():
+        raise ImportError('numpy')
+
+    monkeypatch.setattr('flow.libs.datetime.timezone._numpy', _numpy)
+    values = [datetime(2018, 11, 4, 2, 30), datetime(2019, 6, 1, 12)]
+
+    assert datetimes_from_utc(values) == [datetime_from_utc(item) for item in values]
+    assert datetimes_to_utc(values) == [datetime_to_utc(item) for item in values]
+    assert datetimes_from_utc([]) == datetimes_to_utc([]) == []
+
+
+def test_datetime_to_utc_ignores_tzinfo_and_microseconds():
+    localtime = datetime(2020, 1, 1, 10, 0, 0, 999, tzinfo=utc)
+    assert datetime_to_utc(localtime) == datetime(2020, 1, 1, 13, 0, tzinfo=utc)
+
+
+def test_get_timezone_is_memoized():
+    assert get_timezone('America/Sao_Paulo') is get_timezone('America/Sao_Paulo')
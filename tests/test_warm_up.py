@@ -0,0 +1,97 @@
+import sys
+
+import pytest
+
+from flow.libs.databases.storage.crud_base import CrudBase
+from flow.libs.databases.storage.resource import storage_resource
+from flow.libs.databases.warm_up import warm_up_storage, warm_up_in_memory
+from flow.libs.importtime import import_time_report, parse_import_time
+
+try:
+    from flow.rpc.warm_up import WarmUp
+except ImportError:  # pragma: no cover
+    WarmUp = None
+
+IMPORT_TIME_OUTPUT = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        80 |        300 | encodings
+import time:        50 |       5000 | flow.rpc
+import time:      1500 |       1500 |     pymongo.collection
+ignored line
+'''
+
+
+@storage_resource(
+    database='test',
+    subject='warm_customer',
+    indexes=['shelf_id#ASC,journey_name#DESC', 'step#ASC']
+)
+class WarmCustomerRepository(CrudBase):
+    primed = list()
+
+    def prime_cache(self):
+        self.primed.append(self.subject)
+
+
+@pytest.fixture
+def pinged(in_memory):
+    """Registra os nós que receberam PING"""
+    nodes = list()
+
+    for node, server in in_memory.items():
+        server.ping = lambda node=node: nodes.append(node)
+
+    return nodes
+
+
+def test_ensure_indexes(storage):
+    names = WarmCustomerRepository().ensure_indexes()
+
+    assert names == ['shelf_id_1_journey_name_-1', 'step_1']
+    assert storage['test']['warm_customer'].index_information()['shelf_id_1_journey_name_-1']['key'] == \
+        [('shelf_id', 1), ('journey_name', -1)]
+
+
+def test_warm_up_storage(storage):
+    WarmCustomerRepository.primed.clear()
+
+    elapsed = warm_up_storage([WarmCustomerRepository])
+
+    assert list(elapsed) == ['test.warm_customer']
+    assert 'step_1' in storage['test']['warm_customer'].index_information()
+    assert WarmCustomerRepository.primed == ['warm_customer']
+
+
+def test_warm_up_in_memory_pings_every_node(in_memory, pinged):
+    elapsed = warm_up_in_memory(['STATE', 'CACHE'])
+
+    assert list(elapsed) == ['STATE', 'CACHE']
+    assert sorted(pinged) == sorted(list(in_memory) * 2)
+
+
+@pytest.mark.skipif(WarmUp is None, reason='nameko indisponível neste interpretador')
+def test_warm_up_setup(storage, in_memory, pinged, capsys):
+    WarmUp(repositories=[WarmCustomerRepository], types_in_memory=['STATE']).setup()
+
+    assert 'step_1' in storage['test']['warm_customer'].index_information()
+    assert sorted(pinged) == sorted(in_memory)
+    assert 'Warm up de [test.warm_customer]' in capsys.readouterr().out
+
+
+def test_parse_import_time():
+    assert parse_import_time(IMPORT_TIME_OUTPUT) == [
+        ('flow.rpc', 50, 5000),
+        ('pymongo.collection', 1500, 1500),
+        ('encodings', 80, 300),
+        ('_io', 120, 120)
+    ]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='-X importtime depende do Python 3.7+')
+def test_import_time_report():
+    report = import_time_report('flow.libs.databases.hash_ring', limit=100)
+    cumulative = [item[2] for item in report]
+
+    assert 'flow.libs.databases.hash_ring' in [item[0] for item in report]
+    assert cumulative == sorted(cumulative, reverse=True)
+    assert len(import_time_report('flow.libs.databases.hash_ring', limit=2)) == 2
@@ -0,0 +1,139 @@
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from flow.libs.databases.storage.crud_base import CrudBase
+from flow.libs.databases.storage.resource import storage_resource
+from flow.libs.databases.storage.write_behind import WriteBehind
+
+
+@storage_resource(
+    database='test',
+    subject='journey_customer'
+)
+class CustomerRepository(CrudBase):
+    pass
+
+
+@storage_resource(
+    database='test',
+    subject='verified_customer',
+    verify_insert=True,
+    key_fields='shelf_id'
+)
+class VerifiedCustomerRepository(CrudBase):
+    pass
+
+
+class FailingCollection(object):
+    """Coleção que não grava os documentos marcados com 'fail'"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def insert_many(self, documents: list, ordered: bool = True):
+        errors = [{'index': index, 'code': 121} for index, item in enumerate(documents) if item.get('fail')]
+        stored = [item for item in documents if not item.get('fail')]
+        if stored:
+            self.collection.insert_many(stored, ordered=ordered)
+        if errors:
+            raise BulkWriteError({'writeErrors': errors})
+
+
+def collection(storage):
+    return storage['test']['journey_customer']
+
+
+def test_enqueue_returns_id_before_storing(storage, stream):
+    writer = WriteBehind(CustomerRepository(), consumer='c1')
+
+    res = writer.enqueue({'shelf_id': '1'})
+
+    assert ObjectId.is_valid(res['_id'])
+    assert collection(storage).count_documents({}) == 0
+    assert stream.xlen(str(writer)) == 1
+
+
+def test_flush_stores_documents_and_acknowledges(storage, stream):
+    writer = WriteBehind(CustomerRepository(), consumer='c1')
+    ids = [writer.enqueue({'shelf_id': str(index)})['_id'] for index in range(3)]
+
+    assert writer.flush() == {'flushed': 3, 'failed': 0}
+    assert writer.flush() == {'flushed': 0, 'failed': 0}
+
+    stored = list(collection(storage).find())
+    assert sorted(str(item['_id']) for item in stored) == sorted(ids)
+    assert all('at' in item['__inserted__'] for item in stored)
+    assert writer.lag() == {'length': 0, 'pending': 0, 'oldest_age': 0, 'dead': 0}
+
+
+def test_redelivery_is_idempotent(storage, stream):
+    crashed = WriteBehind(CustomerRepository(), consumer='crashed', min_idle_time=1000)
+    _id = crashed.enqueue({'shelf_id': '1'})['_id']
+
+    # O consumidor grava o documento, mas não chega a confirmar a mensagem
+    stream.xgroup_create(str(crashed), crashed.group, id='0')
+    stream.xreadgroup(crashed.group, 'crashed', {str(crashed): '>'})
+    collection(storage).insert_one({'_id': ObjectId(_id), 'shelf_id': '1'})
+    assert crashed.lag()['pending'] == 1
+
+    stream.advance(1000)
+    writer = WriteBehind(CustomerRepository(), consumer='c2', min_idle_time=1000)
+
+    assert writer.flush() == {'flushed': 1, 'failed': 0}
+    assert collection(storage).count_documents({}) == 1
+    assert writer.lag()['pending'] == 0
+
+
+def test_failed_messages_go_to_dead_letter(storage, stream, monkeypatch):
+    monkeypatch.setattr('flow.libs.databases.storage.crud_base.get_storage_connection',
+                        lambda type_connection, database, subject: FailingCollection(storage[database][subject]))
+
+    writer = WriteBehind(CustomerRepository(), consumer='c1', min_idle_time=1000, max_deliveries=3)
+    writer.enqueue({'shelf_id': '1'})
+    writer.enqueue({'shelf_id': '2', 'fail': True})
+
+    assert writer.flush() == {'flushed': 1, 'failed': 1}
+    assert writer.lag()['pending'] == 1
+
+    # Reentregas até atingir o limite de entregas
+    for _ in range(2):
+        stream.advance(1000)
+        assert writer.flush() == {'flushed': 0, 'failed': 1}
+
+    stream.advance(1000)
+    assert writer.flush() == {'flushed': 0, 'failed': 0}
+
+    lag = writer.lag()
+    assert lag['pending'] == 0
+    assert lag['length'] == 0
+    assert lag['dead'] == 1
+
+    message_id, fields = stream.xrange(writer.dead_letter)[0]
+    assert fields[b'times_delivered'] == b'3'
+    assert collection(storage).count_documents({}) == 1
+
+
+def test_lag_does_not_create_stream(stream):
+    writer = WriteBehind(CustomerRepository())
+
+    assert writer.lag() == {'length': 0, 'pending': 0, 'oldest_age': 0, 'dead': 0}
+    assert not stream.exists(str(writer))
+    assert not stream.groups
+
+
+def test_lag_does_not_create_group(storage, stream):
+    writer = WriteBehind(CustomerRepository(), consumer='c1')
+    writer.enqueue({'shelf_id': '1'})
+
+    lag = writer.lag()
+
+    assert lag['length'] == 1
+    assert lag['pending'] == 0
+    assert not stream.groups
+
+
+def test_rejects_repositories_with_verify_insert():
+    with pytest.raises(ValueError):
+        WriteBehind(VerifiedCustomerRepository())
+